@@ -10,8 +10,9 @@ within the same file.
 """
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import date
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import sys
 from pathlib import Path
 
@@ -68,6 +69,16 @@ class TransactionRepository(ABC):
         """
         pass
     
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group the writes made inside the block into one database transaction.
+        
+        Committed when the block exits, rolled back if it raises. Backends
+        without support commit each write on its own.
+        """
+        yield
+    
     @abstractmethod
     def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
         """
@@ -2,14 +2,16 @@
 SQLite implementation of the TransactionRepository.
 
 This module provides a local SQLite database for storing transactions.
-The database file is stored in the data/ directory by default.
+The database file is stored in the data/ directory by default, in WAL mode
+(so a transactions.db-wal file sits next to it while a connection is open).
 """
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import date, datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 import sys
 
 # Add parent directory to path for imports
@@ -19,6 +21,20 @@ from src.parsers.base import Transaction, TransactionType, AccountType
 from src.database.repository import TransactionRepository
 
 
+_TRANSACTION_COLUMNS = (
+    "id", "date", "amount", "description", "account_id", "account_type",
+    "bank_source", "source_file", "balance", "original_category", "category",
+    "transaction_type", "merchant_name", "location", "foreign_amount",
+    "foreign_currency", "created_at",
+)
+_ROW_PLACEHOLDERS = "(" + ", ".join("?" * len(_TRANSACTION_COLUMNS)) + ")"
+_INSERT_SQL = f"INSERT INTO transactions ({', '.join(_TRANSACTION_COLUMNS)}) VALUES "
+_INSERT_OR_IGNORE_SQL = f"INSERT OR IGNORE INTO transactions ({', '.join(_TRANSACTION_COLUMNS)}) VALUES "
+
+# Rows per multi-row INSERT, kept under SQLite's historical 999 bound-parameter limit
+_ROWS_PER_INSERT = 999 // len(_TRANSACTION_COLUMNS)
+
+
 class SQLiteRepository(TransactionRepository):
     """
     SQLite implementation of TransactionRepository.
@@ -37,6 +53,7 @@ class SQLiteRepository(TransactionRepository):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn: Optional[sqlite3.Connection] = None
+        self._batch_depth = 0
         self.initialize()
     
     @property
@@ -45,6 +62,14 @@ class SQLiteRepository(TransactionRepository):
         if self._conn is None:
             self._conn = sqlite3.connect(str(self.db_path))
             self._conn.row_factory = sqlite3.Row
+            # WAL: no rollback-journal double write, and readers are not blocked
+            # by a commit. NORMAL only fsyncs at checkpoints, which is still
+            # crash-safe in WAL mode (a power loss can drop the last commits).
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+            self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
         return self._conn
     
     def initialize(self) -> None:
@@ -94,35 +119,86 @@ class SQLiteRepository(TransactionRepository):
     
     def save_transaction(self, transaction: Transaction, verbose: bool = False) -> bool:
         """Save a single transaction. Returns False if duplicate."""
+        saved = self._insert_transaction(self.conn.cursor(), transaction, verbose)
+        self._commit()
+        return saved
+    
+    def save_transactions(self, transactions: List[Transaction], verbose: bool = False) -> Tuple[int, int]:
+        """
+        Save multiple transactions in one commit. Returns (saved_count, skipped_count).
+        
+        If saving fails part-way, none of this call's rows are kept (even
+        inside a batch()).
+        """
+        saved_count = 0
+        skipped_count = 0
         cursor = self.conn.cursor()
+        cursor.execute("SAVEPOINT save_transactions")
         try:
-            cursor.execute("""
-                INSERT INTO transactions
-                (id, date, amount, description, account_id, account_type,
-                 bank_source, source_file, balance, original_category, category,
-                 transaction_type, merchant_name, location, foreign_amount,
-                 foreign_currency, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                transaction.id,
-                transaction.date.isoformat(),
-                str(transaction.amount),
-                transaction.description,
-                transaction.account_id,
-                transaction.account_type.value,
-                transaction.bank_source,
-                transaction.source_file,
-                str(transaction.balance) if transaction.balance is not None else None,
-                transaction.original_category,
-                transaction.category,
-                transaction.transaction_type.value,
-                transaction.merchant_name,
-                transaction.location,
-                str(transaction.foreign_amount) if transaction.foreign_amount is not None else None,
-                transaction.foreign_currency,
-                transaction.created_at.isoformat(),
-            ))
+            if verbose:
+                # Row at a time so each row can be reported
+                for txn in transactions:
+                    if self._insert_transaction(cursor, txn, verbose):
+                        saved_count += 1
+                    else:
+                        skipped_count += 1
+            else:
+                # Multi-row INSERT OR IGNORE: rowcount is the number actually
+                # inserted, the rest were duplicates
+                for start in range(0, len(transactions), _ROWS_PER_INSERT):
+                    chunk = transactions[start:start + _ROWS_PER_INSERT]
+                    cursor.execute(
+                        _INSERT_OR_IGNORE_SQL + ", ".join([_ROW_PLACEHOLDERS] * len(chunk)),
+                        [value for txn in chunk for value in self._transaction_row(txn)],
+                    )
+                    saved_count += cursor.rowcount
+                    skipped_count += len(chunk) - cursor.rowcount
+        except BaseException:
+            cursor.execute("ROLLBACK TO save_transactions")
+            cursor.execute("RELEASE save_transactions")
+            raise
+        # Outside a batch this ends the transaction the savepoint opened
+        cursor.execute("RELEASE save_transactions")
+        self._commit()
+        return saved_count, skipped_count
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group the writes made inside the block into one transaction (one fsync).
+        
+        Committed when the outermost block exits, rolled back if it raises.
+        """
+        outermost = self._batch_depth == 0
+        if outermost and not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if outermost:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if outermost:
+            try:
+                self.conn.commit()
+            except BaseException:
+                # A failed COMMIT (e.g. database is locked) leaves the
+                # transaction open; drop it so the next batch starts clean
+                self.conn.rollback()
+                raise
+    
+    def _commit(self) -> None:
+        """Commit, unless a batch() is open (it commits once when it exits)."""
+        if not self._batch_depth:
             self.conn.commit()
+    
+    def _insert_transaction(self, cursor: sqlite3.Cursor, transaction: Transaction, verbose: bool) -> bool:
+        """Insert one transaction without committing. Returns False if duplicate."""
+        try:
+            cursor.execute(_INSERT_SQL + _ROW_PLACEHOLDERS, self._transaction_row(transaction))
             if verbose:
                 print(f"    [SAVED] {transaction.id}")
             return True
@@ -132,16 +208,28 @@ class SQLiteRepository(TransactionRepository):
                 print(f"    [SKIP] {transaction.id} - duplicate")
             return False
     
-    def save_transactions(self, transactions: List[Transaction], verbose: bool = False) -> Tuple[int, int]:
-        """Save multiple transactions. Returns (saved_count, skipped_count)."""
-        saved_count = 0
-        skipped_count = 0
-        for txn in transactions:
-            if self.save_transaction(txn, verbose):
-                saved_count += 1
-            else:
-                skipped_count += 1
-        return saved_count, skipped_count
+    @staticmethod
+    def _transaction_row(transaction: Transaction) -> tuple:
+        """Column values for a transaction, in _TRANSACTION_COLUMNS order."""
+        return (
+            transaction.id,
+            transaction.date.isoformat(),
+            str(transaction.amount),
+            transaction.description,
+            transaction.account_id,
+            transaction.account_type.value,
+            transaction.bank_source,
+            transaction.source_file,
+            str(transaction.balance) if transaction.balance is not None else None,
+            transaction.original_category,
+            transaction.category,
+            transaction.transaction_type.value,
+            transaction.merchant_name,
+            transaction.location,
+            str(transaction.foreign_amount) if transaction.foreign_amount is not None else None,
+            transaction.foreign_currency,
+            transaction.created_at.isoformat(),
+        )
     
     def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
         """Get a transaction by its ID."""
@@ -244,7 +332,7 @@ class SQLiteRepository(TransactionRepository):
         """Delete a transaction by ID."""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
     
     def update_transaction_category(
@@ -258,7 +346,7 @@ class SQLiteRepository(TransactionRepository):
             "UPDATE transactions SET category = ? WHERE id = ?",
             (category, transaction_id)
         )
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
     
     def get_distinct_values(self, field: str) -> List[str]:
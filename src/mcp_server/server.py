@@ -18,9 +18,11 @@ Usage:
     uv run mcp run src/mcp_server/server.py
 """
 
+import asyncio
 import logging
 import os
 import sys
+import threading
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
@@ -47,14 +49,22 @@ logging.getLogger("mcp").setLevel(logging.WARNING)
 _db: Optional[PostgresRepository] = None
 _context_store: Optional[FinancialContextStore] = None
 
+# Tools run queries on worker threads (asyncio.to_thread), so several can hit
+# the lazy initialisers at once on a cold server; the locks make sure only one
+# repository (and one connection pool) is ever created
+_db_lock = threading.Lock()
+_context_store_lock = threading.Lock()
+
 
 def get_db() -> PostgresRepository:
     """Get or create database repository with SQLAlchemy connection pooling."""
     global _db
     if _db is None:
-        logger.info("Creating new database repository with SQLAlchemy connection pooling...")
-        _db = PostgresRepository()
-        logger.info("Database repository established (connection pool active)")
+        with _db_lock:
+            if _db is None:
+                logger.info("Creating new database repository with SQLAlchemy connection pooling...")
+                _db = PostgresRepository()
+                logger.info("Database repository established (connection pool active)")
     return _db
 
 
@@ -62,7 +72,9 @@ def get_context_store() -> FinancialContextStore:
     """Get or create context store."""
     global _context_store
     if _context_store is None:
-        _context_store = FinancialContextStore()
+        with _context_store_lock:
+            if _context_store is None:
+                _context_store = FinancialContextStore()
     return _context_store
 
 
@@ -618,6 +630,34 @@ def get_month_comparison(year: int, month: int) -> dict:
     }
 
 
+@mcp.tool()
+async def get_full_monthly_report_bundle(year: int, month: int) -> dict:
+    """Get all monthly report data in one call: summary, comparison, categories, merchants and banks.
+    
+    Prefer this over calling the individual monthly tools one by one.
+    
+    Args:
+        year: Year (e.g., 2025)
+        month: Month (1-12)
+    """
+    # The underlying queries are independent; run them concurrently on
+    # worker threads, each with its own pooled connection.
+    comparison, by_category, top_merchants, by_bank = await asyncio.gather(
+        asyncio.to_thread(get_month_comparison, year, month),
+        asyncio.to_thread(get_spending_by_category, year, month),
+        asyncio.to_thread(get_top_merchants, year, month),
+        asyncio.to_thread(get_transactions_by_bank, year, month),
+    )
+    
+    return {
+        "summary": comparison["current_month"],
+        "comparison": comparison,
+        "by_category": by_category,
+        "top_merchants": top_merchants,
+        "by_bank": by_bank,
+    }
+
+
 @mcp.tool()
 def execute_sql(query: str) -> dict:
     """Execute a read-only SQL query. Only SELECT statements allowed.
@@ -799,6 +839,55 @@ def get_table_schema(table_name: str = "transactions") -> dict:
         }
 
 
+# Read-only tools that batch_execute may dispatch to
+BATCHABLE_TOOLS = {
+    "get_financial_context": get_financial_context,
+    "get_account_context": get_account_context,
+    "get_property_context": get_property_context,
+    "query_transactions": query_transactions,
+    "get_monthly_summary": get_monthly_summary,
+    "get_spending_by_category": get_spending_by_category,
+    "get_transactions_by_bank": get_transactions_by_bank,
+    "get_top_merchants": get_top_merchants,
+    "get_month_comparison": get_month_comparison,
+    "execute_sql": execute_sql,
+    "get_available_months": get_available_months,
+    "get_database_stats": get_database_stats,
+    "get_table_schema": get_table_schema,
+}
+
+
+@mcp.tool()
+async def batch_execute(operations: list[dict], max_concurrent: int = 4) -> dict:
+    """Run several independent read-only tools in one call and return all results.
+    
+    Use this instead of calling tools one at a time when the calls do not
+    depend on each other's results.
+    
+    Args:
+        operations: List of {"tool": "<tool name>", "arguments": {...}}
+        max_concurrent: Maximum number of operations to run at once (default 4)
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    
+    async def run(operation: dict) -> dict:
+        tool_name = operation.get("tool")
+        func = BATCHABLE_TOOLS.get(tool_name)
+        if func is None:
+            return {"tool": tool_name, "error": f"Unknown or non-batchable tool. Available: {sorted(BATCHABLE_TOOLS)}"}
+        
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(func, **(operation.get("arguments") or {}))
+                return {"tool": tool_name, "result": result}
+            except Exception as e:
+                logger.warning(f"batch_execute: {tool_name} failed: {e}")
+                return {"tool": tool_name, "error": str(e)}
+    
+    results = await asyncio.gather(*(run(operation) for operation in operations))
+    return {"count": len(results), "results": results}
+
+
 # Run with streamable HTTP transport
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
@@ -16,6 +16,10 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 import csv
 import json
+import re
+
+# Fast path for the "%d/%m/%Y" dates every bank export uses
+_DMY_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
 
 
 class TransactionType(Enum):
@@ -279,6 +283,14 @@ class BaseParser(ABC):
     
     def _parse_date(self, date_str: str, format: str = "%d/%m/%Y") -> date:
         """Parse a date string to a date object."""
+        if format == "%d/%m/%Y":
+            # strptime re-interprets the format on every call; this is the
+            # same parse for the common format (other inputs fall through so
+            # errors are unchanged)
+            match = _DMY_DATE_RE.fullmatch(date_str)
+            if match:
+                day, month, year = match.groups()
+                return date(int(year), int(month), int(day))
         return datetime.strptime(date_str, format).date()
     
     def _parse_amount(self, amount_str: str) -> Decimal:
@@ -18,6 +18,13 @@ Environment Variables:
     SENDER_EMAIL: Sender email address
     RECEIVER_EMAIL: Recipient email address
     MCP_SERVER_URL: MCP server URL (default: http://192.168.1.237:8000/mcp)
+    REPORT_CACHE_DIR: Cache for generated report parts (default: ~/.cache/family-finance/reports)
+    REPORT_CACHE_TTL_HOURS: Cache entry lifetime in hours (default: 24, 0 disables)
+    FLEX_CACHE_DIR: Cache for IBKR flex query responses (default: ~/.cache/family-finance/flex)
+    FLEX_CACHE_TTL_HOURS: Flex response lifetime in hours (default: 24, 0 disables)
+    REPORT_PART_TIMEOUT: Max seconds for one report part's agent run (default: 600)
+    MAX_REPEATED_TOOL_CALLS: Abort a part after the same tool call fails this many times (default: 3)
+    REPORT_MAX_CONCURRENCY: Report parts generated at the same time (default: 2)
 """
 
 import os
@@ -26,16 +33,22 @@ import re
 import asyncio
 import logging
 import argparse
+import json
+import uuid
+from collections import Counter
+from contextlib import AsyncExitStack
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
+from typing import Optional
 from calendar import monthrange
 
-from mcp_agent.app import MCPApp
-from mcp_agent.agents.agent import Agent
-from mcp_agent.workflows.llm.augmented_llm_anthropic import AnthropicAugmentedLLM
-from mcp_agent.config import Settings, get_settings
-
-from .email_sender import send_report_email
+from .email_sender import (
+    send_report_email_async,
+    warm_up_email_sender,
+    close_default_sender,
+    render_markdown,
+)
+from .report_cache import ReportCache
+from .anthropic_patches import enable_prompt_caching, get_shared_http_client, close_shared_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -44,14 +57,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 50
+
 # Get IBKR Flex Query ID from environment (default to the configured query)
 IBKR_FLEX_QUERY_ID = os.environ.get("IBKR_FLEX_QUERY_ID", "1359561")
 
+# Tools each report part may use (anything it needs beyond the pre-fetched data)
+PART1_TOOLS = {
+    "get_financial_context",
+    "get_full_monthly_report_bundle",
+    "query_transactions",
+    "batch_execute",
+    "get_flex_query",
+}
+PART2_TOOLS = {
+    "get_financial_context",
+    "get_full_monthly_report_bundle",
+    "query_transactions",
+    "batch_execute",
+}
+
+# Guards against runaway agent tool-call loops
+REPORT_PART_TIMEOUT = float(os.environ.get("REPORT_PART_TIMEOUT", "600"))
+MAX_REPEATED_TOOL_CALLS = int(os.environ.get("MAX_REPEATED_TOOL_CALLS", "3"))
+
+# Upper bound on report parts running their LLM tool loop at the same time
+# (set to 1 on rate-limited API tiers)
+REPORT_MAX_CONCURRENCY = int(os.environ.get("REPORT_MAX_CONCURRENCY", "2"))
+_part_semaphore = asyncio.Semaphore(max(1, REPORT_MAX_CONCURRENCY))
+
 # Base system prompt for the financial analyst agent
 BASE_SYSTEM_PROMPT = """You are a financial analyst assistant for a family finance tracking system.
 You have access to tools that can query a database containing bank transactions from multiple accounts,
 as well as tools to query investment portfolio data from Interactive Brokers.
 
+When you need several family-finance tools whose inputs do not depend on each other's results,
+call `batch_execute` ONCE with all of them instead of calling them one at a time.
+For other independent tools, request them together in a single turn rather than one per turn.
+
 IMPORTANT: Your response will be sent directly as an email report. Do NOT include:
 - Any preamble like "I'll generate a report..." or "Let me check..."
 - Any mention of tool calls like "[Calling tool...]" or "Using get_monthly_summary..."
@@ -72,7 +115,8 @@ You are generating the FIRST HALF of a comprehensive financial report. Focus on:
 
 ## Step 1: Understand the Financial Context
 
-BEFORE generating the report, ALWAYS call `get_financial_context` first. This provides:
+BEFORE generating the report, ALWAYS read the financial context (pre-fetched in the user
+message when available, otherwise call `get_financial_context`). This provides:
 - Household members and their roles
 - All accounts with their types and purposes (mortgage, offset, credit card, etc.)
 - Properties with addresses (if any)
@@ -83,7 +127,8 @@ Use this context to provide meaningful labels instead of raw account IDs.
 
 ## Step 2: Get Investment Portfolio Data (REQUIRED)
 
-**THIS IS MANDATORY** - You MUST call `get_flex_query` with queryId="{IBKR_FLEX_QUERY_ID}" to get investment portfolio data.
+**THIS IS MANDATORY** - You MUST use the investment portfolio data. If `get_flex_query` results are
+pre-fetched in the user message, use them; otherwise call `get_flex_query` with queryId="{IBKR_FLEX_QUERY_ID}".
 
 This provides:
 - Account information and total NAV in the `ChangeInNAV` section (look for `endingValue`)
@@ -99,9 +144,10 @@ This is the most important data - we want to see every transaction.
 
 ## Step 4: Get Summary Data
 
-Use these tools:
-1. get_monthly_summary - for income/expense totals
-2. get_month_comparison - for month-over-month changes
+Use the `get_full_monthly_report_bundle` data (pre-fetched in the user message when
+available, otherwise call it ONCE for the month). Its `summary` and `comparison`
+keys give income/expense totals and month-over-month changes - do not call the
+individual monthly tools separately.
 
 ## Report Format for PART 1 (FOLLOW EXACTLY)
 
@@ -128,7 +174,6 @@ Output this EXACTLY (with section numbers):
 - Any unusual transactions or patterns
 
 ## 3. 💳 Credit Card Spending Detail
-Use `query_transactions` with the credit card account_id to get credit card transactions.
 
 **Credit Card Summary:**
 
@@ -138,29 +183,18 @@ Use `query_transactions` with the credit card account_id to get credit card tran
 | Transactions | X |
 | Average | $X |
 
-**Top 5 Largest Purchases:**
+**Top 5 Largest Purchases:** (5 rows, largest first)
 
 | Date | Description | Amount |
 |------|-------------|--------|
-| Nov XX | XXX | $X |
-| Nov XX | XXX | $X |
-| Nov XX | XXX | $X |
-| Nov XX | XXX | $X |
-| Nov XX | XXX | $X |
+| [Mon DD] | XXX | $X |
 
-**Spending by Category:**
+**Spending by Category:** (one row per category with spend, labelled 🍽️ Dining, 🛒 Groceries,
+🛍️ Shopping, 🔄 Subscriptions, ⛽ Transport, 🎬 Entertainment, 💡 Utilities, 🏥 Healthcare, Other)
 
 | Category | Amount | Count |
 |----------|--------|-------|
 | 🍽️ Dining | $X | X |
-| 🛒 Groceries | $X | X |
-| 🛍️ Shopping | $X | X |
-| 🔄 Subscriptions | $X | X |
-| ⛽ Transport | $X | X |
-| 🎬 Entertainment | $X | X |
-| 💡 Utilities | $X | X |
-| 🏥 Healthcare | $X | X |
-| Other | $X | X |
 
 ## 4. 📈 Investment Portfolio (REQUIRED)
 **Total Portfolio Value:** $X USD (~$X AUD at 1.51 rate)
@@ -181,9 +215,6 @@ Use `query_transactions` with the credit card account_id to get credit card tran
 - Breakdown by symbol
 
 **Interest Income:** $X USD (if any)
-
----
-END OF PART 1 - Part 2 will continue with spending categories, merchants, and recommendations.
 """
 
 # System prompt for PART 2: Categories, Merchants, Recommendations
@@ -198,13 +229,15 @@ You are generating the SECOND HALF of a comprehensive financial report. Focus on
 
 ## Step 1: Understand the Financial Context
 
-Call `get_financial_context` first to understand account labels and purposes.
+Read the financial context first (pre-fetched in the user message when available,
+otherwise call `get_financial_context`) to understand account labels and purposes.
 
 ## Step 2: Gather Data
 
-Use these tools:
-1. get_spending_by_category - for spending patterns
-2. get_top_merchants - for top 5 merchants only
+Use the `get_full_monthly_report_bundle` data (pre-fetched in the user message when
+available, otherwise call it ONCE for the month). Use its `by_category` key for
+spending patterns and the first 5 entries of `top_merchants` - do not call the
+individual monthly tools separately.
 
 ## Report Format for PART 2 (FOLLOW EXACTLY)
 
@@ -249,6 +282,66 @@ Use these tools:
   - NO nested bullet lists inside tables
 """
 
+# User prompt templates, filled in per run with str.format()
+USER_PROMPT_MONTH_PART1 = """Generate PART 1 of the monthly financial report for {month_name} {year} (month {month_num}).
+
+This part should include:
+1. Title and Executive Summary (with summary table)
+2. Key Highlights (3-5 bullet points)
+3. Credit Card Spending (summary + top 5 transactions + spending by category)
+4. Investment Portfolio (holdings, dividends, trades)
+
+Use get_full_monthly_report_bundle with year={year} and month={month_num}.
+Use query_transactions with the credit card account_id and start_date="{start_str}" and end_date="{end_str}".
+Use get_flex_query for investment portfolio data.
+
+Keep it concise - only top 5 credit card transactions, not all."""
+
+USER_PROMPT_MONTH_PART2 = """Generate PART 2 of the monthly financial report for {month_name} {year} (month {month_num}).
+
+This part should include:
+5. Spending Breakdown by Category (all accounts)
+6. Top 5 Merchants
+7. Key Observations & Recommendations
+8. Footer
+
+Use get_full_monthly_report_bundle with year={year} and month={month_num} (top 5 merchants only).
+
+Keep it concise - no month-over-month comparison needed."""
+
+PART1_SUMMARY_RENDERED_NOTE = """
+
+Section 1 (Executive Summary) is rendered separately from the same data. Do NOT output it -
+start your output with "## 2. 🚨 Key Highlights"."""
+
+USER_PROMPT_RANGE_PART1 = """Generate PART 1 of the financial report for the period {period_label}.
+
+This part should include:
+1. Title and Executive Summary (with summary table)
+2. Key Highlights (3-5 bullet points)
+3. Credit Card Spending (summary + top 5 transactions + spending by category)
+4. Investment Portfolio (holdings, dividends, trades)
+
+Use a single batch_execute call with two query_transactions operations: one with start_date="{start_str}" and end_date="{end_str}" to get all transactions, and one with the credit card account_id and the same dates for credit card transactions.
+Use get_flex_query for investment portfolio data.
+
+For the summary, calculate totals from the transaction data.
+Keep it concise - only top 5 credit card transactions, not all."""
+
+USER_PROMPT_RANGE_PART2 = """Generate PART 2 of the financial report for the period {period_label}.
+
+This part should include:
+5. Spending Breakdown by Category (all accounts)
+6. Top 5 Merchants
+7. Key Observations & Recommendations
+8. Footer
+
+Use query_transactions with start_date="{start_str}" and end_date="{end_str}" to get all transactions.
+Then calculate category breakdown and top merchants from the transaction data.
+
+Keep it concise - no month-over-month comparison needed."""
+
+
 def setup_ibkr_environment():
     """
     Ensure IB_FLEX_TOKEN is available for the interactive-brokers MCP server.
@@ -271,30 +364,85 @@ def setup_ibkr_environment():
     # The mcp library uses get_default_environment() which only returns minimal vars
     # We need to ensure our token is passed through
     try:
-        from mcp.client.stdio import get_default_environment
         import mcp.client.stdio as stdio_module
         
-        original_get_default_environment = get_default_environment
+        original_get_default_environment = stdio_module.get_default_environment
+        if getattr(original_get_default_environment, "_ib_flex_token", False):
+            return
         
         def patched_get_default_environment():
             """Return default environment plus IB_FLEX_TOKEN."""
             env = original_get_default_environment()
-            # Add IB_FLEX_TOKEN from current environment
-            if "IB_FLEX_TOKEN" in os.environ:
-                env["IB_FLEX_TOKEN"] = os.environ["IB_FLEX_TOKEN"]
+            env["IB_FLEX_TOKEN"] = ib_token
             return env
         
-        # Monkey-patch the function
+        # Monkey-patch the function (marked so repeat calls don't wrap it again)
+        patched_get_default_environment._ib_flex_token = True
         stdio_module.get_default_environment = patched_get_default_environment
         logger.info("Patched get_default_environment to include IB_FLEX_TOKEN")
     except ImportError as e:
-        logger.warning(f"Could not patch mcp.client.stdio: {e}")
+        logger.warning("Could not patch mcp.client.stdio: %s", e)
+
 
+# The MCPApp is created on first use (mcp_agent pulls in the Anthropic SDK and
+# the MCP stack, so it is not imported until a report is actually generated).
+# Its running context is entered once per process and shared by every report
+# part, so MCP server connections and tool registration are set up once.
+app = None
+_app_stack: AsyncExitStack | None = None
+_app_lock = asyncio.Lock()
 
-# Setup IBKR environment before creating the app
-setup_ibkr_environment()
 
-app = MCPApp(name="finance_report_generator")
+async def get_running_app():
+    """Create the MCPApp and enter app.run() on first use; return the shared app."""
+    global app, _app_stack
+    async with _app_lock:
+        if _app_stack is None:
+            from mcp_agent.app import MCPApp
+            
+            # Setup IBKR environment before creating the app
+            setup_ibkr_environment()
+            
+            # Cache the large static system prompts across agent turns
+            enable_prompt_caching()
+            
+            app = MCPApp(name="finance_report_generator")
+            stack = AsyncExitStack()
+            await stack.enter_async_context(app.run())
+            _app_stack = stack
+            logger.info("MCPApp started")
+    return app
+
+
+async def shutdown_app():
+    """Close the shared MCPApp context and HTTP client (no-op if never started)."""
+    global _app_stack
+    async with _app_lock:
+        if _app_stack is not None:
+            stack, _app_stack = _app_stack, None
+            await stack.aclose()
+        close_shared_http_client()
+
+
+def _prev_month(d: datetime) -> datetime:
+    """Return the first day of the month before d."""
+    year, month = (d.year, d.month - 1) if d.month > 1 else (d.year - 1, 12)
+    return d.replace(year=year, month=month, day=1)
+
+
+def default_period(now: datetime) -> tuple[datetime, datetime]:
+    """Return the first and last day of the month before now (the default report period)."""
+    start_date = _prev_month(now)
+    _, last_day = monthrange(start_date.year, start_date.month)
+    return start_date, start_date.replace(day=last_day)
+
+
+# Whole lines (including their newline) in the agent output that are tool
+# call artifacts or conversational preambles rather than report content
+_CLEAN_RE = re.compile(
+    r"^[ \t]*(?:\[Calling tool|Perfect!|Great!|Let me\b|I'll\b|I will\b|Now let me\b)[^\n]*\n?",
+    re.MULTILINE,
+)
 
 
 def clean_report(report: str) -> str:
@@ -304,26 +452,158 @@ def clean_report(report: str) -> str:
     The mcp-agent library sometimes includes [Calling tool...] lines
     in the output. This function strips them out.
     """
-    # Remove lines that start with [Calling tool
-    lines = report.split('\n')
-    cleaned_lines = []
+    # Drop artifact lines in a single regex pass, then strip leading/trailing whitespace
+    return _CLEAN_RE.sub('', report).strip()
+
+
+report_cache = ReportCache()
+
+# IBKR flex query responses, cached separately with their own lifetime
+flex_cache = ReportCache(
+    cache_dir=os.environ.get("FLEX_CACHE_DIR") or report_cache.cache_dir.parent / "flex",
+    ttl_hours=float(os.environ.get("FLEX_CACHE_TTL_HOURS", "24")),
+)
+
+
+def get_model_id() -> str:
+    """Return the configured Anthropic model, used to scope cached report parts."""
+    from mcp_agent.config import get_settings
     
-    for line in lines:
-        # Skip lines that are tool call artifacts
-        if line.strip().startswith('[Calling tool'):
-            continue
-        # Skip lines that look like "Perfect!" or "Let me" preambles
-        if re.match(r'^(Perfect!|Great!|Let me|I\'ll|I will|Now let me)', line.strip()):
-            continue
-        cleaned_lines.append(line)
+    settings = get_settings()
+    return settings.anthropic.default_model if settings.anthropic else ""
+
+
+_llm_class = None
+
+
+def get_llm_class():
+    """
+    Return AnthropicAugmentedLLM extended with tool-call loop detection.
     
-    # Join and strip leading/trailing whitespace
-    result = '\n'.join(cleaned_lines).strip()
+    Every tool result is appended to the conversation and re-sent on each
+    turn, so an agent stuck retrying the same call burns tokens quickly.
+    The part is aborted once an identical call (same tool and arguments)
+    has failed more than MAX_REPEATED_TOOL_CALLS times.
     
-    return result
+    Completion requests are also sent through the shared pooled HTTP client
+    instead of a new client (and TLS handshake) per turn.
+    """
+    global _llm_class
+    if _llm_class is None:
+        from mcp_agent.utils.common import ensure_serializable
+        from mcp_agent.workflows.llm.augmented_llm_anthropic import (
+            AnthropicAugmentedLLM,
+            AnthropicCompletionTasks,
+        )
+        
+        def request_completion(request):
+            """
+            AnthropicCompletionTasks.request_completion_task over the shared HTTP client.
+            
+            Synchronous, so the executor runs it on a worker thread.
+            """
+            from anthropic import Anthropic
+            
+            client = Anthropic(
+                api_key=request.config.api_key,
+                base_url=getattr(request.config, "base_url", None),
+                http_client=get_shared_http_client(),
+            )
+            return ensure_serializable(client.messages.create(**request.payload))
+        
+        class SharedHttpClientExecutor:
+            """Executor wrapper that swaps in request_completion for direct Anthropic requests."""
+            
+            def __init__(self, executor):
+                self._executor = executor
+            
+            def __getattr__(self, name):
+                return getattr(self._executor, name)
+            
+            async def execute(self, task, *args, **kwargs):
+                if task is AnthropicCompletionTasks.request_completion_task and args:
+                    if args[0].config.provider in (None, "", "anthropic"):
+                        task = request_completion
+                return await self._executor.execute(task, *args, **kwargs)
+        
+        class LoopGuardedAnthropicLLM(AnthropicAugmentedLLM):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self._tool_call_counts = Counter()
+                self.executor = SharedHttpClientExecutor(self.executor)
+            
+            async def call_tool(self, request, tool_call_id=None):
+                # Only failed calls count: repeating a successful call is
+                # wasteful but not a loop, while retrying the same failing
+                # call is what runs away
+                try:
+                    result = await super().call_tool(request, tool_call_id)
+                except Exception:
+                    self._count_failure(request)
+                    raise
+                if getattr(result, "isError", False):
+                    self._count_failure(request)
+                return result
+            
+            def _count_failure(self, request):
+                name = request.params.name
+                key = (name, json.dumps(request.params.arguments or {}, sort_keys=True, default=str))
+                self._tool_call_counts[key] += 1
+                if self._tool_call_counts[key] > MAX_REPEATED_TOOL_CALLS:
+                    raise RuntimeError(
+                        f"Tool-call loop detected: {name} failed {self._tool_call_counts[key]} "
+                        f"times with the same arguments"
+                    )
+        
+        _llm_class = LoopGuardedAnthropicLLM
+    return _llm_class
 
 
-async def generate_report_part(system_prompt: str, user_prompt: str, part_name: str) -> str:
+_agent_class = None
+
+
+def get_agent_class():
+    """
+    Return mcp-agent's Agent extended with an optional tool allowlist.
+    
+    Every tool schema the agent exposes is re-sent on every LLM turn, so each
+    part only exposes the tools it actually uses. Names in the allowlist are
+    the tools' own names, without the "<server>_" namespace prefix.
+    """
+    global _agent_class
+    if _agent_class is None:
+        from mcp_agent.agents.agent import Agent
+        
+        class ToolFilteredAgent(Agent):
+            tool_allowlist: Optional[set] = None
+            
+            def _base_tool_name(self, name: str) -> str:
+                for server_name in self.server_names:
+                    if name.startswith(f"{server_name}_"):
+                        return name[len(server_name) + 1:]
+                return name
+            
+            async def list_tools(self, *args, **kwargs):
+                result = await super().list_tools(*args, **kwargs)
+                if self.tool_allowlist is not None:
+                    result.tools = [
+                        tool for tool in result.tools
+                        if self._base_tool_name(tool.name) in self.tool_allowlist
+                    ]
+                return result
+        
+        _agent_class = ToolFilteredAgent
+    return _agent_class
+
+
+async def generate_report_part(
+    system_prompt: str,
+    user_prompt: str,
+    part_name: str,
+    server_names: list[str],
+    tool_allowlist: Optional[set] = None,
+    use_cache: bool = True
+) -> str:
     """
     Generate a part of the financial report using the MCP agent.
     
@@ -331,37 +611,233 @@ async def generate_report_part(system_prompt: str, user_prompt: str, part_name:
         system_prompt: The system prompt for this part
         user_prompt: The user prompt for this part
         part_name: Name of the part for logging
+        server_names: MCP servers this part needs
+        tool_allowlist: Tool names to expose to the LLM (default: all tools)
+        use_cache: Reuse a cached result for identical prompts (it is always stored)
     
     Returns:
         The generated report part as markdown string.
     """
-    async with app.run() as running_app:
-        logger.info(f"MCPApp started for {part_name}, creating agent...")
-        
-        # Create the financial analyst agent
-        agent = Agent(
-            name=f"finance_analyst_{part_name}",
-            instruction=system_prompt,
-            server_names=["family-finance", "interactive-brokers"],
+    # Identical prompts (same period, same pre-fetched data) and model give the
+    # same report part; reuse it instead of paying for another LLM run.
+    cache_key = ReportCache.make_key(system_prompt, user_prompt, get_model_id(), *sorted(tool_allowlist or ()))
+    cached = report_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        logger.info("Using cached %s (%d chars)", part_name, len(cached))
+        return cached
+    
+    async with _part_semaphore:
+        report_part = await _run_report_part_agent(
+            system_prompt, user_prompt, part_name, server_names, tool_allowlist
         )
-        
-        async with agent:
-            # List available tools for logging
+    
+    report_cache.put(cache_key, report_part)
+    return report_part
+
+
+async def _run_report_part_agent(
+    system_prompt: str,
+    user_prompt: str,
+    part_name: str,
+    server_names: list[str],
+    tool_allowlist: Optional[set]
+) -> str:
+    """Run one report part's agent and LLM tool loop (see generate_report_part)."""
+    await get_running_app()
+    logger.info("Creating agent for %s...", part_name)
+    
+    # A fresh agent/LLM per part keeps conversation history from leaking
+    # between parts; the expensive app and server setup is shared.
+    agent = get_agent_class()(
+        name=f"finance_analyst_{part_name}",
+        instruction=system_prompt,
+        server_names=server_names,
+    )
+    agent.tool_allowlist = tool_allowlist
+    
+    async with agent:
+        # List available tools for debugging only; the LLM discovers tools itself
+        if logger.isEnabledFor(logging.DEBUG):
             tools = await agent.list_tools()
-            tool_names = [t[0] if isinstance(t, tuple) else getattr(t, 'name', str(t)) for t in tools]
-            logger.info(f"Agent ({part_name}) has access to {len(tool_names)} tools")
-            
-            # Attach the Anthropic LLM (uses model from mcp_agent.config.yaml)
-            llm = await agent.attach_llm(AnthropicAugmentedLLM)
-            
-            # Generate the report part
-            logger.info(f"Generating {part_name}...")
-            report_part = await llm.generate_str(message=user_prompt)
-            
-            return report_part
+            # Entries are homogeneous, so check the shape once rather than per tool
+            if isinstance(next(iter(tools), None), tuple):
+                tool_names = [t[0] for t in tools]
+            else:
+                tool_names = [getattr(t, 'name', None) or str(t) for t in tools]
+            logger.debug("Agent (%s) has access to %d tools", part_name, len(tool_names))
+        
+        # Attach the Anthropic LLM (uses model from mcp_agent.config.yaml)
+        llm = await agent.attach_llm(get_llm_class())
+        
+        # Generate the report part, with a hard ceiling on the whole tool loop
+        logger.info("Generating %s...", part_name)
+        async with asyncio.timeout(REPORT_PART_TIMEOUT):
+            return await llm.generate_str(message=user_prompt)
+
+
+async def preflight_fetch(calls: dict[str, dict]) -> dict[str, str]:
+    """
+    Fetch independent tool results concurrently before the LLM runs.
+    
+    Args:
+        calls: Mapping of tool name to its arguments
+    
+    Returns:
+        Mapping of tool name to the raw result text. Tools that fail are left
+        out, so the agent falls back to calling them itself.
+    """
+    from mcp_agent.agents.agent import Agent
+    
+    await get_running_app()
+    
+    agent = Agent(
+        name="finance_preflight",
+        instruction="Fetch report data.",
+        server_names=["family-finance", "interactive-brokers"],
+    )
+    
+    async with agent:
+        results = await asyncio.gather(
+            *(agent.call_tool(name=name, arguments=arguments) for name, arguments in calls.items()),
+            return_exceptions=True,
+        )
+    
+    prefetched = {}
+    for name, result in zip(calls, results):
+        if isinstance(result, BaseException) or getattr(result, "isError", False):
+            logger.warning("Pre-fetch of %s failed, agent will call it directly: %s", name, result)
+            continue
+        prefetched[name] = compact_tool_result(name, "\n".join(
+            content.text for content in result.content if getattr(content, "text", None)
+        ))
+    
+    logger.info("Pre-fetched %d/%d tools: %s", len(prefetched), len(calls), ", ".join(prefetched))
+    return prefetched
+
+
+def _slim_flex(data, in_positions: bool = False):
+    """
+    Drop flex query detail the report does not use.
+    
+    OpenPositions come back both per-lot and as per-symbol SUMMARY rows; the
+    report only uses the SUMMARY rows, so any other levelOfDetail is dropped
+    there. Other sections (Trades, CashTransactions, ...) keep all their rows.
+    Empty values are dropped too. The rest of the structure is kept as-is.
+    """
+    if isinstance(data, dict):
+        slim = {
+            key: _slim_flex(value, in_positions or key == "OpenPositions")
+            for key, value in data.items()
+        }
+        return {key: value for key, value in slim.items() if value not in (None, "", [], {})}
+    if isinstance(data, list):
+        return [
+            _slim_flex(item, in_positions) for item in data
+            if not (
+                in_positions
+                and isinstance(item, dict)
+                and item.get("levelOfDetail", "SUMMARY") != "SUMMARY"
+            )
+        ]
+    return data
+
+
+def compact_tool_result(name: str, text: str) -> str:
+    """
+    Re-serialise a JSON tool result without whitespace (and slim flex data).
+    
+    Pre-fetched results are injected into the prompts and re-sent on every LLM
+    turn, so indentation alone costs a noticeable number of tokens. Results
+    that are not JSON are returned unchanged.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text
+    if name == "get_flex_query":
+        data = _slim_flex(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def format_prefetched(prefetched: dict[str, str]) -> str:
+    """Render pre-fetched tool results as a context block for the user prompt."""
+    if not prefetched:
+        return ""
+    
+    blocks = [
+        "## Pre-fetched Data",
+        "The following tool results were already fetched for this report. "
+        "Use them directly and do NOT call these tools again.",
+    ]
+    for name, result in prefetched.items():
+        blocks.append(f"### {name}\n```json\n{result}\n```")
+    
+    return "\n\n" + "\n\n".join(blocks)
+
 
+def _money(amount: float) -> str:
+    """Format an amount as $1,234.56 (sign in front of the dollar sign)."""
+    return f"-${abs(amount):,.2f}" if amount < 0 else f"${amount:,.2f}"
 
-async def generate_report(start_date: datetime = None, end_date: datetime = None) -> str:
+
+def _change(amount: float, percent: Optional[float] = None) -> str:
+    """Format a month-over-month change the way the report format asks for it."""
+    arrow = "⬆️" if amount >= 0 else "⬇️"
+    signed = f"+{_money(amount)}" if amount >= 0 else _money(amount)
+    if percent is None:
+        return f"{arrow} {signed}"
+    return f"{arrow} {abs(percent):.1f}% ({signed})"
+
+
+def render_executive_summary(bundle_json: str, start_date: datetime, end_date: datetime) -> Optional[str]:
+    """
+    Render section 1 of a monthly report from the pre-fetched bundle.
+    
+    The executive summary table is a straight transformation of the bundle's
+    comparison data, so it is rendered here instead of by the LLM. Returns
+    None if the bundle does not have the expected shape, in which case Part 1
+    writes the section itself.
+    """
+    try:
+        comparison = json.loads(bundle_json)["comparison"]
+        current = comparison["current_month"]
+        changes = comparison["changes"]
+        previous_month = datetime(
+            comparison["previous_month"]["year"], comparison["previous_month"]["month"], 1
+        ).strftime("%B")
+        rows = [
+            ("Total Income", current["total_income"],
+             _change(changes["income_change"], changes["income_change_percent"])),
+            ("Total Expenses", current["total_expenses"],
+             _change(changes["expense_change"], changes["expense_change_percent"])),
+            ("Net Position", current["net"], _change(changes["net_change"])),
+        ]
+        transaction_count = current["transaction_count"]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning("Could not render executive summary from bundle: %s", e)
+        return None
+    
+    lines = [
+        "## 1. Executive Summary",
+        "",
+        f"# Monthly Financial Report: {start_date:%B %Y}",
+        "",
+        f"**Period:** {start_date:%B} 1-{end_date.day}, {start_date.year} | "
+        f"**Transactions:** {transaction_count}",
+        "",
+        f"| Metric | Amount | Change vs {previous_month} |",
+        "|--------|--------|---------------------------|",
+    ]
+    lines += [f"| {label} | {_money(amount)} | {change} |" for label, amount, change in rows]
+    return "\n".join(lines)
+
+
+async def generate_report(
+    start_date: datetime = None,
+    end_date: datetime = None,
+    part_done: Optional[asyncio.Event] = None,
+    use_cache: bool = True
+) -> str:
     """
     Generate a comprehensive financial report in two parts to avoid token limits.
     
@@ -371,19 +847,15 @@ async def generate_report(start_date: datetime = None, end_date: datetime = None
     Args:
         start_date: Start date for the report period (default: first day of last month)
         end_date: End date for the report period (default: last day of last month)
+        part_done: Optional event set as soon as the first part has finished
+        use_cache: Reuse cached report parts for identical prompts
     
     Returns:
         The combined report as markdown string.
     """
     # Calculate target period
-    today = datetime.now()
-    
     if start_date is None or end_date is None:
-        # Default: last month
-        last_month = today - relativedelta(months=1)
-        start_date = last_month.replace(day=1)
-        _, last_day = monthrange(last_month.year, last_month.month)
-        end_date = last_month.replace(day=last_day)
+        start_date, end_date = default_period(datetime.now())
     
     # Format dates for display and queries
     start_str = start_date.strftime("%Y-%m-%d")
@@ -400,93 +872,85 @@ async def generate_report(start_date: datetime = None, end_date: datetime = None
         month_name = start_date.strftime("%B")
         year = start_date.year
         month_num = start_date.month
-        period_label = f"{month_name} {year}"
-        period_detail = f"{month_name} 1-{end_date.day}, {year}"
-        prev_month_name = (start_date - relativedelta(months=1)).strftime('%B %Y')
-        
-        # User prompt for Part 1 (single month)
-        user_prompt_part1 = f"""Generate PART 1 of the monthly financial report for {month_name} {year} (month {month_num}).
-
-This part should include:
-1. Title and Executive Summary (with summary table)
-2. Key Highlights (3-5 bullet points)
-3. Credit Card Spending (summary + top 5 transactions + spending by category)
-4. Investment Portfolio (holdings, dividends, trades)
-
-Use get_monthly_summary with year={year} and month={month_num}.
-Use query_transactions with the credit card account_id and start_date="{start_str}" and end_date="{end_str}".
-Use get_flex_query for investment portfolio data.
-
-Keep it concise - only top 5 credit card transactions, not all."""
-
-        # User prompt for Part 2 (single month)
-        user_prompt_part2 = f"""Generate PART 2 of the monthly financial report for {month_name} {year} (month {month_num}).
-
-This part should include:
-5. Spending Breakdown by Category (all accounts)
-6. Top 5 Merchants
-7. Key Observations & Recommendations
-8. Footer
-
-Use get_spending_by_category and get_top_merchants (top_n=5) with year={year} and month={month_num}.
-
-Keep it concise - no month-over-month comparison needed."""
+        prompt_fields = dict(month_name=month_name, year=year, month_num=month_num,
+                             start_str=start_str, end_str=end_str)
+        user_prompt_part1 = USER_PROMPT_MONTH_PART1.format(**prompt_fields)
+        user_prompt_part2 = USER_PROMPT_MONTH_PART2.format(**prompt_fields)
     else:
         # Date range - use date-based queries
         period_label = f"{start_str} to {end_str}"
-        period_detail = f"{start_date.strftime('%B %d, %Y')} - {end_date.strftime('%B %d, %Y')}"
-        
-        # User prompt for Part 1 (date range)
-        user_prompt_part1 = f"""Generate PART 1 of the financial report for the period {period_label}.
+        prompt_fields = dict(period_label=period_label, start_str=start_str, end_str=end_str)
+        user_prompt_part1 = USER_PROMPT_RANGE_PART1.format(**prompt_fields)
+        user_prompt_part2 = USER_PROMPT_RANGE_PART2.format(**prompt_fields)
 
-This part should include:
-1. Title and Executive Summary (with summary table)
-2. Key Highlights (3-5 bullet points)
-3. Credit Card Spending (summary + top 5 transactions + spending by category)
-4. Investment Portfolio (holdings, dividends, trades)
-
-Use query_transactions with start_date="{start_str}" and end_date="{end_str}" to get all transactions.
-Use query_transactions with the credit card account_id and start_date="{start_str}" and end_date="{end_str}" for credit card transactions.
-Use get_flex_query for investment portfolio data.
-
-For the summary, calculate totals from the transaction data.
-Keep it concise - only top 5 credit card transactions, not all."""
-
-        # User prompt for Part 2 (date range)
-        user_prompt_part2 = f"""Generate PART 2 of the financial report for the period {period_label}.
-
-This part should include:
-5. Spending Breakdown by Category (all accounts)
-6. Top 5 Merchants
-7. Key Observations & Recommendations
-8. Footer
-
-Use query_transactions with start_date="{start_str}" and end_date="{end_str}" to get all transactions.
-Then calculate category breakdown and top merchants from the transaction data.
-
-Keep it concise - no month-over-month comparison needed."""
-
-    # Generate Part 1
-    logger.info("=" * 40)
-    logger.info("Generating Part 1: Summary, Credit Card, Investments")
-    logger.info("=" * 40)
-    part1 = await generate_report_part(SYSTEM_PROMPT_PART1, user_prompt_part1, "part1")
-    logger.info(f"Part 1 generated ({len(part1)} chars)")
+    # Fetch the data both parts need up front, concurrently, so neither
+    # agent spends an LLM turn per tool call on it
+    preflight_calls = {"get_financial_context": {}}
+    if is_single_month:
+        preflight_calls["get_full_monthly_report_bundle"] = {"year": year, "month": month_num}
+    
+    # IBKR flex queries are slow external calls; reuse a recent response for
+    # the same query and period when there is one (v2: entries slimmed by the
+    # old filter, which dropped non-position rows, are not reused)
+    flex_key = f"flex-v2-{IBKR_FLEX_QUERY_ID}-{start_str}-{end_str}"
+    cached_flex = flex_cache.get(flex_key, suffix=".json")
+    if cached_flex is None:
+        preflight_calls["get_flex_query"] = {"queryId": IBKR_FLEX_QUERY_ID}
     
-    # Generate Part 2
+    prefetched = await preflight_fetch(preflight_calls)
+    if cached_flex is not None:
+        logger.info("Using cached flex query %s", IBKR_FLEX_QUERY_ID)
+        prefetched["get_flex_query"] = cached_flex
+    elif "get_flex_query" in prefetched:
+        flex_cache.put(flex_key, prefetched["get_flex_query"], suffix=".json")
+    
+    # The executive summary table needs no reasoning; render it directly
+    executive_summary = None
+    if "get_full_monthly_report_bundle" in prefetched:
+        executive_summary = render_executive_summary(
+            prefetched["get_full_monthly_report_bundle"], start_date, end_date
+        )
+    if executive_summary is not None:
+        user_prompt_part1 += PART1_SUMMARY_RENDERED_NOTE
+    
+    # Portfolio data is only used by Part 1
+    user_prompt_part1 += format_prefetched(prefetched)
+    user_prompt_part2 += format_prefetched(
+        {name: result for name, result in prefetched.items() if name != "get_flex_query"}
+    )
+    
+    # Generate both parts concurrently. They have independent prompts and
+    # agents, and share the running app's MCP server connections.
     logger.info("=" * 40)
-    logger.info("Generating Part 2: Categories, Merchants, Recommendations")
+    logger.info("Generating Part 1 (Summary, Credit Card, Investments) and "
+                "Part 2 (Categories, Merchants, Recommendations)")
     logger.info("=" * 40)
-    part2 = await generate_report_part(SYSTEM_PROMPT_PART2, user_prompt_part2, "part2")
-    logger.info(f"Part 2 generated ({len(part2)} chars)")
-    
-    # Combine the parts
-    # Remove the "END OF PART 1" marker if present
-    part1_cleaned = re.sub(r'---\s*END OF PART 1.*$', '', part1, flags=re.DOTALL).strip()
+    async with asyncio.TaskGroup() as tg:
+        part1_task = tg.create_task(generate_report_part(
+            SYSTEM_PROMPT_PART1, user_prompt_part1, "part1",
+            server_names=["family-finance", "interactive-brokers"],
+            tool_allowlist=PART1_TOOLS,
+            use_cache=use_cache,
+        ))
+        part2_task = tg.create_task(generate_report_part(
+            SYSTEM_PROMPT_PART2, user_prompt_part2, "part2",
+            server_names=["family-finance"],
+            tool_allowlist=PART2_TOOLS,
+            use_cache=use_cache,
+        ))
+        if part_done is not None:
+            for task in (part1_task, part2_task):
+                task.add_done_callback(lambda _: part_done.set())
+    part1 = part1_task.result()
+    part2 = part2_task.result()
+    if executive_summary is not None:
+        part1 = f"{executive_summary}\n\n{part1.lstrip()}"
+    logger.info("Part 1 generated (%d chars)", len(part1))
+    logger.info("Part 2 generated (%d chars)", len(part2))
     
-    # Combine
-    combined_report = f"{part1_cleaned}\n\n{part2}"
-    logger.info(f"Combined report: {len(combined_report)} chars")
+    # Combine the parts with a fixed separator
+    combined_report = f"{part1.rstrip()}\n\n---\n\n{part2.lstrip()}"
+    logger.info("Combined report: %d chars", len(combined_report))
     
     return combined_report
 
@@ -541,6 +1005,12 @@ Examples:
         help="Generate report but don't send email (print to stdout instead)"
     )
     
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the report even if a cached one exists for this period"
+    )
+    
     return parser.parse_args()
 
 
@@ -573,7 +1043,7 @@ def get_date_range(args) -> tuple[datetime, datetime]:
         _, last_day = monthrange(args.year, args.month)
         end_date = datetime(args.year, args.month, last_day)
         
-        logger.info(f"Using month mode: {start_date.strftime('%B %Y')}")
+        logger.info("Using month mode: %s", start_date.strftime('%B %Y'))
         return start_date, end_date
     
     elif has_date_range:
@@ -594,7 +1064,7 @@ def get_date_range(args) -> tuple[datetime, datetime]:
         if start_date > end_date:
             raise ValueError(f"Start date ({args.start}) must be before end date ({args.end})")
         
-        logger.info(f"Using date range mode: {args.start} to {args.end}")
+        logger.info("Using date range mode: %s to %s", args.start, args.end)
         return start_date, end_date
     
     else:
@@ -603,63 +1073,198 @@ def get_date_range(args) -> tuple[datetime, datetime]:
         return None, None  # generate_report() will handle the default
 
 
-def main():
-    """Main entry point for the report generator."""
-    # Parse command-line arguments
-    args = parse_args()
+# Background report jobs for non-blocking callers (schedulers, webhooks, MCP
+# tool wrappers). main() keeps the blocking flow.
+_JOBS: dict[str, asyncio.Task] = {}
+
+
+def start_report(start_date: datetime = None, end_date: datetime = None) -> str:
+    """
+    Start generating a report in the background on the running event loop.
     
-    logger.info("=" * 50)
-    logger.info("Family Finance Report Generator")
-    logger.info(f"Started at: {datetime.now().isoformat()}")
-    logger.info("=" * 50)
+    Returns:
+        Job ID to pass to poll_report()
+    """
+    job_id = uuid.uuid4().hex
+    _JOBS[job_id] = asyncio.create_task(generate_report(start_date, end_date), name=f"report-{job_id}")
+    logger.info("Started report job %s", job_id)
+    return job_id
+
+
+def poll_report(job_id: str) -> dict:
+    """
+    Get the status of a background report job.
+    
+    Returns:
+        {"status": "running"}, {"status": "done", "report": ...},
+        {"status": "failed", "error": ...} or {"status": "unknown"}.
+        Finished jobs are forgotten once their result has been returned.
+    """
+    task = _JOBS.get(job_id)
+    if task is None:
+        return {"status": "unknown"}
+    if not task.done():
+        return {"status": "running"}
+    
+    del _JOBS[job_id]
+    if task.cancelled():
+        return {"status": "failed", "error": "cancelled"}
+    if task.exception() is not None:
+        return {"status": "failed", "error": str(task.exception())}
+    return {"status": "done", "report": clean_report(task.result())}
+
+
+def build_subject(start_date: datetime, end_date: datetime) -> str:
+    """Build the email subject line for the report period."""
+    if start_date.year == end_date.year and start_date.month == end_date.month:
+        period_str = start_date.strftime('%B %Y')
+    else:
+        period_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+    
+    return f"Family Finance Report - {period_str}"
+
+
+def report_cache_key(start_date: datetime, end_date: datetime) -> str:
+    """
+    Cache key for a finished report: the period plus everything that shapes it
+    (flex query, prompts, model), so prompt or model changes never reuse a stale report.
+    """
+    prompt_hash = ReportCache.make_key(
+        IBKR_FLEX_QUERY_ID, get_model_id(),
+        SYSTEM_PROMPT_PART1, SYSTEM_PROMPT_PART2,
+        USER_PROMPT_MONTH_PART1, USER_PROMPT_MONTH_PART2,
+        USER_PROMPT_RANGE_PART1, USER_PROMPT_RANGE_PART2, PART1_SUMMARY_RENDERED_NOTE,
+    )
+    return f"report-{start_date:%Y-%m-%d}-{end_date:%Y-%m-%d}-{prompt_hash[:12]}"
+
+
+async def run_report(
+    start_date: datetime = None,
+    end_date: datetime = None,
+    no_email: bool = False,
+    now: datetime = None,
+    force: bool = False
+) -> bool:
+    """
+    Generate, clean and deliver the report inside a single event loop.
+    
+    When emailing, the SMTP connection (DNS, TLS, AUTH) is opened in a worker
+    thread as soon as the first report part finishes, overlapping the
+    remaining LLM turns, so the send only pays for the message transfer.
+    Waiting for the first part (rather than starting at once) keeps the
+    session from sitting idle long enough for the server to drop it. The
+    send itself also runs in a worker thread (see send_report_email_async)
+    so delivery does not block the loop.
+    
+    A finished report is cached per period (and prompt/model version) before
+    it is sent, so a retry or re-send for the same period - including after an
+    SMTP failure - skips generation entirely unless force is set.
+    
+    Returns:
+        True if the report was delivered (or printed with --no-email)
+    """
+    # Resolve the default period once so the prompts and the subject agree
+    if start_date is None or end_date is None:
+        start_date, end_date = default_period(now or datetime.now())
+    
+    first_part_done = asyncio.Event()
+    
+    async def warm_up_after_first_part():
+        await first_part_done.wait()
+        return await warm_up_email_sender()
+    
+    smtp_warmup = None if no_email else asyncio.create_task(warm_up_after_first_part())
     
     try:
-        # Determine date range from arguments
-        start_date, end_date = get_date_range(args)
+        cache_key = report_cache_key(start_date, end_date)
+        report_content = None if force else report_cache.get(cache_key)
+        from_cache = report_content is not None
         
-        if start_date and end_date:
-            logger.info(f"Report period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        if from_cache:
+            logger.info("Steps 1-2: Using cached report for this period (%d chars, --force to regenerate)",
+                        len(report_content))
+            report_path = report_cache.path(cache_key)
+            first_part_done.set()
         else:
-            logger.info("Report period: Last month (default)")
-        
-        # Step 1: Generate report using AI agent with MCP tools
-        logger.info("Step 1: Generating report with AI agent...")
-        raw_report = asyncio.run(generate_report(start_date, end_date))
-        logger.info(f"Raw report generated ({len(raw_report)} chars)")
-        
-        # Step 2: Clean up the report (remove tool-calling artifacts)
-        logger.info("Step 2: Cleaning report...")
-        report_content = clean_report(raw_report)
-        logger.info(f"Cleaned report ({len(report_content)} chars)")
+            # Step 1: Generate report using AI agent with MCP tools
+            logger.info("Step 1: Generating report with AI agent...")
+            try:
+                raw_report = await generate_report(
+                    start_date, end_date, part_done=first_part_done, use_cache=not force
+                )
+            finally:
+                await shutdown_app()
+            logger.info("Raw report generated (%d chars)", len(raw_report))
+            
+            # Step 2: Clean up the report (remove tool-calling artifacts)
+            logger.info("Step 2: Cleaning report...")
+            report_content = clean_report(raw_report)
+            logger.info("Cleaned report (%d chars)", len(report_content))
+            # Persisted before sending so an SMTP failure doesn't throw the LLM run away
+            report_path = report_cache.put(cache_key, report_content)
         
         # Step 3: Send email (or print to stdout if --no-email)
-        if args.no_email:
+        if no_email:
             logger.info("Step 3: Printing report to stdout (--no-email specified)")
             print("\n" + "=" * 60)
             print(report_content)
             print("=" * 60 + "\n")
-            sys.exit(0)
+            return True
         
         logger.info("Step 3: Sending email...")
+        # The rendered HTML is cached next to the markdown, so re-sends skip conversion
+        rendered_html = report_cache.get(cache_key, suffix=".html") if from_cache else None
+        if rendered_html is None:
+            rendered_html = render_markdown(report_content)
+            report_cache.put(cache_key, rendered_html, suffix=".html")
+        await smtp_warmup
+        sent = await send_report_email_async(
+            subject=build_subject(start_date, end_date),
+            body=report_content,
+            content_type="markdown",
+            rendered_html=rendered_html
+        )
+        if not sent:
+            if report_path is not None:
+                logger.error("Report kept at %s - re-run to resend without regenerating", report_path)
+            else:
+                logger.error("Report cache is disabled - printing the report so it is not lost")
+                print(report_content)
+        return sent
+    finally:
+        if smtp_warmup is not None:
+            smtp_warmup.cancel()  # no-op once it has finished
+            await asyncio.gather(smtp_warmup, return_exceptions=True)
+            await asyncio.to_thread(close_default_sender)
+
+
+def main():
+    """Main entry point for the report generator."""
+    # Parse command-line arguments
+    args = parse_args()
+    
+    logger.info(_BANNER)
+    logger.info("Family Finance Report Generator")
+    # Single reference time for the whole run (log, default period, subject)
+    started_at = datetime.now()
+    logger.info("Started at: %s", started_at.isoformat())
+    logger.info(_BANNER)
+    
+    try:
+        # Determine date range from arguments
+        start_date, end_date = get_date_range(args)
         
-        # Build subject line with date range info
         if start_date and end_date:
-            if start_date.year == end_date.year and start_date.month == end_date.month:
-                period_str = start_date.strftime('%B %Y')
-            else:
-                period_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+            logger.info("Report period: %s to %s", start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
         else:
-            # Default: last month
-            last_month = datetime.now() - relativedelta(months=1)
-            period_str = last_month.strftime('%B %Y')
+            logger.info("Report period: Last month (default)")
         
-        subject = f"Family Finance Report - {period_str}"
+        success = asyncio.run(run_report(
+            start_date, end_date, no_email=args.no_email, now=started_at, force=args.force
+        ))
         
-        success = send_report_email(
-            subject=subject,
-            body=report_content,
-            content_type="markdown"
-        )
+        if args.no_email:
+            sys.exit(0)
         
         if success:
             logger.info("Report sent successfully!")
@@ -669,10 +1274,10 @@ def main():
             sys.exit(1)
             
     except ValueError as e:
-        logger.error(f"Invalid arguments: {e}")
+        logger.error("Invalid arguments: %s", e)
         sys.exit(2)
     except Exception as e:
-        logger.exception(f"Report generation failed: {e}")
+        logger.exception("Report generation failed: %s", e)
         sys.exit(1)
 
 
@@ -14,12 +14,16 @@ import os
 import json
 import asyncio
 import logging
+import threading
 from typing import Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from mcp.client.streamable_http import streamable_http_client
 from mcp import ClientSession
 
+from .ai_client import get_anthropic_sdk_client, get_openai_sdk_client
+from .anthropic_patches import CACHE_CONTROL
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,11 +34,106 @@ class AgentConfig:
     ai_provider: str  # "anthropic" or "openai"
     model: str
     max_iterations: int = 10  # Prevent infinite loops
+    max_repeated_turns: int = 0  # Stop when the same tool calls repeat this many turns in a row (0 = off)
+    tool_timeout_default: float = 30.0  # Seconds before a tool call is reported to the model as failed
+    tool_timeouts: dict[str, float] = field(default_factory=dict)  # Per-tool overrides
+    # Older tool results are elided once they exceed this many characters (0 = keep all)
+    history_budget_chars: int = 60_000
+    # (tool name, arguments) calls every report makes; started before the first LLM turn
+    speculative_tools: list[tuple[str, dict]] = field(default_factory=list)
+
+
+class MCPSessionPool:
+    """
+    Initialized MCP client sessions, reused across generate_report() calls.
+    
+    Opening a session costs a connection, the initialize handshake and a
+    list_tools() round trip, so each server URL keeps one session (and its
+    tool list) open until close_all(). Each session is owned by a holder task,
+    because the transport's anyio cancel scopes must be exited by the task that
+    entered them; any task on the same event loop can use or close it.
+    """
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._entries: dict[str, tuple[asyncio.Task, asyncio.Event, asyncio.Future]] = {}
+    
+    async def _hold(self, url: str, ready: asyncio.Future, closing: asyncio.Event):
+        """Open the session for url, publish it via ready, and keep it open until closing is set."""
+        try:
+            logger.info(f"Connecting to MCP server at {url}")
+            # Use Streamable HTTP transport (modern MCP protocol)
+            async with streamable_http_client(url) as (read_stream, write_stream, _):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    logger.info("MCP session initialized")
+                    
+                    tools = (await session.list_tools()).tools
+                    logger.info(f"Discovered {len(tools)} tools")
+                    
+                    ready.set_result((session, tools))
+                    await closing.wait()
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP session for {url} closed with error: {e}")
+    
+    async def acquire(self, url: str) -> tuple[ClientSession, list]:
+        """Return an initialized session and its tools for url, connecting if needed."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Sessions from an earlier event loop (e.g. a previous asyncio.run) are unusable
+            self._loop, self._lock, self._entries = loop, asyncio.Lock(), {}
+        
+        async with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                ready = loop.create_future()
+                closing = asyncio.Event()
+                task = loop.create_task(self._hold(url, ready, closing))
+                entry = self._entries[url] = (task, closing, ready)
+            
+            try:
+                return await asyncio.shield(entry[2])
+            except Exception:
+                self._entries.pop(url, None)
+                raise
+    
+    async def discard(self, url: str):
+        """Close and forget the session for url, e.g. after it failed."""
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            task, closing, _ = entry
+            closing.set()
+            await asyncio.gather(task, return_exceptions=True)
+    
+    async def close_all(self):
+        """Close every pooled session."""
+        for url in list(self._entries):
+            await self.discard(url)
+
+
+_session_pool = MCPSessionPool()
+
+
+async def close_mcp_sessions():
+    """Close the MCP sessions pooled by generate_report()."""
+    await _session_pool.close_all()
 
 
 def mcp_tools_to_anthropic(mcp_tools: list) -> list:
-    """Convert MCP tool format to Anthropic tool format."""
-    return [
+    """
+    Convert MCP tool format to Anthropic tool format.
+    
+    The last tool is marked cacheable so the (static) tool schemas are served
+    from the prompt cache on every turn after the first.
+    """
+    tools = [
         {
             "name": tool.name,
             "description": tool.description,
@@ -42,6 +141,27 @@ def mcp_tools_to_anthropic(mcp_tools: list) -> list:
         }
         for tool in mcp_tools
     ]
+    if tools:
+        tools[-1]["cache_control"] = CACHE_CONTROL
+    return tools
+
+
+def _mark_cache_breakpoint(messages: list, previous: Optional[dict]) -> dict:
+    """
+    Move the rolling prompt-cache breakpoint to the newest user turn.
+    
+    Each loop iteration re-sends the whole history, so caching up to the
+    latest tool results means the next turn only pays for new tokens. Only
+    one message breakpoint is kept (the API allows four in total).
+    """
+    if previous is not None:
+        previous.pop("cache_control", None)
+    
+    content = messages[-1]["content"]
+    if isinstance(content, str):
+        content = messages[-1]["content"] = [{"type": "text", "text": content}]
+    content[-1]["cache_control"] = CACHE_CONTROL
+    return content[-1]
 
 
 def mcp_tools_to_openai(mcp_tools: list) -> list:
@@ -59,35 +179,227 @@ def mcp_tools_to_openai(mcp_tools: list) -> list:
     ]
 
 
+def _tool_cache_key(tool_name: str, tool_input: dict) -> tuple[str, str]:
+    return tool_name, json.dumps(tool_input, sort_keys=True, default=str)
+
+
+def start_speculative_tools(
+    session: ClientSession,
+    calls: list[tuple[str, dict]],
+    timeouts: Optional[dict[str, float]] = None,
+    default_timeout: Optional[float] = None
+) -> dict:
+    """
+    Start tool calls the agent is expected to make before the model asks for them.
+    
+    Returns a tool cache (see execute_tool) holding the in-flight calls, so
+    the agent loop picks up their results instead of calling them again.
+    """
+    cache = {}
+    for tool_name, tool_input in calls:
+        key = _tool_cache_key(tool_name, tool_input)
+        if key not in cache:
+            timeout = (timeouts or {}).get(tool_name, default_timeout)
+            cache[key] = asyncio.ensure_future(_call_tool(session, tool_name, tool_input, timeout))
+    if cache:
+        logger.info(f"Speculatively started {len(cache)} tool call(s)")
+    return cache
+
+
+async def execute_tool(
+    session: ClientSession,
+    tool_name: str,
+    tool_input: dict,
+    cache: Optional[dict] = None,
+    timeout: Optional[float] = None
+) -> tuple[str, bool]:
+    """
+    Execute one tool call via MCP.
+    
+    If a cache dict is given, identical calls (same name and input) within it
+    share one execution, including duplicates in the same turn; the report
+    tools are all read-only. Failed calls are not cached so they can be retried.
+    A call that takes longer than timeout seconds is reported as failed, so
+    one slow tool doesn't stall the whole report.
+    
+    Returns:
+        Tuple of (result text, is_error). Failures are returned as an error
+        message rather than raised so one bad call doesn't sink the turn.
+    """
+    if cache is None:
+        return await _call_tool(session, tool_name, tool_input, timeout)
+    
+    key = _tool_cache_key(tool_name, tool_input)
+    task = cache.get(key)
+    if task is None:
+        task = cache[key] = asyncio.ensure_future(_call_tool(session, tool_name, tool_input, timeout))
+    else:
+        logger.info(f"Reusing result of {tool_name} with input: {key[1]}")
+    
+    result_text, is_error = await task
+    if is_error:
+        cache.pop(key, None)
+    return result_text, is_error
+
+
+async def _call_tool(
+    session: ClientSession,
+    tool_name: str,
+    tool_input: dict,
+    timeout: Optional[float] = None
+) -> tuple[str, bool]:
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Executing tool: {tool_name} with input: {json.dumps(tool_input)}")
+    
+    try:
+        async with asyncio.timeout(timeout):
+            result = await session.call_tool(tool_name, tool_input)
+        # Extract text content from result
+        result_text = "".join(
+            content.text for content in result.content if getattr(content, 'text', None)
+        )
+        
+        logger.info(f"Tool result: {result_text[:200]}...")
+        return result_text, False
+    except TimeoutError:
+        logger.error(f"Tool {tool_name} timed out after {timeout}s")
+        return f"Error: {tool_name} timed out after {timeout}s", True
+    except Exception as e:
+        logger.error(f"Tool execution failed: {e}")
+        return f"Error: {str(e)}", True
+
+
+ELIDED_TOOL_RESULT = "[Earlier tool result elided to save context; call the tool again if needed]"
+
+
+def _trim_tool_history(messages: list, budget_chars: int, keep_last: int):
+    """
+    Elide the oldest tool results once their total size exceeds budget_chars.
+    
+    Every turn re-sends the whole history, so large early results are paid for
+    again on every later turn. Once over budget, results are elided down to
+    half the budget in one go: each elision rewrites the cached prompt prefix,
+    so it should happen rarely rather than one result per turn. The newest
+    keep_last results (the current turn's) are always kept. Handles both Anthropic tool_result blocks and
+    OpenAI role="tool" messages.
+    """
+    if budget_chars <= 0:
+        return
+    
+    results = []
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+        if message.get("role") == "tool":
+            results.append(message)
+        elif isinstance(message.get("content"), list):
+            results.extend(
+                block for block in message["content"]
+                if isinstance(block, dict) and block.get("type") == "tool_result"
+            )
+    
+    total = sum(len(result["content"]) for result in results)
+    if total <= budget_chars:
+        return
+    target = budget_chars // 2
+    elided = 0
+    for result in results[:max(len(results) - keep_last, 0)]:
+        if total <= target:
+            break
+        if result["content"] != ELIDED_TOOL_RESULT:
+            total -= len(result["content"]) - len(ELIDED_TOOL_RESULT)
+            result["content"] = ELIDED_TOOL_RESULT
+            elided += 1
+    if elided:
+        logger.info(f"Elided {elided} earlier tool result(s) to stay within the history budget")
+
+
+def _turn_signature(calls: list[tuple[str, dict]]) -> str:
+    """Order-insensitive signature of one turn's tool calls (names and inputs)."""
+    return json.dumps(sorted(json.dumps([name, tool_input], sort_keys=True, default=str)
+                             for name, tool_input in calls))
+
+
+class _RepeatedTurnGuard:
+    """
+    Detects an agent loop that has stopped making progress.
+    
+    When the model requests exactly the same tool calls turn after turn, the
+    results (and so the next turn) will not change, and the loop would only
+    burn tokens until max_iterations. A turn after one with a failed tool call
+    is never counted as a repeat: retrying a failed call (e.g. a timeout) is
+    progress, and failures are not cached so the retry can succeed.
+    """
+    
+    def __init__(self, max_repeated_turns: int):
+        self.max_repeated_turns = max_repeated_turns
+        self._last_signature = None
+        self._repeats = 0
+    
+    def is_stuck(self, calls: list[tuple[str, dict]]) -> bool:
+        if self.max_repeated_turns <= 0:
+            return False
+        signature = _turn_signature(calls)
+        self._repeats = self._repeats + 1 if signature == self._last_signature else 1
+        self._last_signature = signature
+        if self._repeats >= self.max_repeated_turns:
+            logger.warning(f"Stopping agent loop: same tool calls requested {self._repeats} turns in a row")
+            return True
+        return False
+    
+    def record_results(self, any_failed: bool):
+        """Record the outcome of the turn last passed to is_stuck()."""
+        if any_failed:
+            self._last_signature = None
+            self._repeats = 0
+
+
 async def run_anthropic_agent(
     session: ClientSession,
     tools: list,
     system_prompt: str,
     user_prompt: str,
     model: str,
-    max_iterations: int
+    max_iterations: int,
+    max_repeated_turns: int = 0,
+    tool_cache: Optional[dict] = None,
+    history_budget_chars: int = 0,
+    tool_timeouts: Optional[dict[str, float]] = None,
+    tool_timeout_default: Optional[float] = None
 ) -> str:
     """Run agentic loop with Anthropic Claude."""
-    import anthropic
-    
-    client = anthropic.Anthropic()
+    client = get_anthropic_sdk_client()
     anthropic_tools = mcp_tools_to_anthropic(tools)
     
+    # Static prefix (tools + system) is cached across turns and report runs
+    system = [{"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL}]
     messages = [{"role": "user", "content": user_prompt}]
+    cache_breakpoint = None
+    guard = _RepeatedTurnGuard(max_repeated_turns)
+    tool_cache = {} if tool_cache is None else tool_cache
+    tool_timeouts = tool_timeouts or {}
     
     for iteration in range(max_iterations):
         logger.info(f"Iteration {iteration + 1}/{max_iterations}")
+        cache_breakpoint = _mark_cache_breakpoint(messages, cache_breakpoint)
         
         # Call Claude
-        response = client.messages.create(
+        # The SDK call blocks; run it in a thread so in-flight tool calls progress
+        response = await asyncio.to_thread(
+            client.messages.create,
             model=model,
             max_tokens=8192,
-            system=system_prompt,
+            system=system,
             tools=anthropic_tools,
             messages=messages
         )
         
         logger.info(f"Stop reason: {response.stop_reason}")
+        usage = response.usage
+        logger.info(
+            f"Prompt cache: {getattr(usage, 'cache_creation_input_tokens', None)} written, "
+            f"{getattr(usage, 'cache_read_input_tokens', None)} read, {usage.input_tokens} uncached input tokens"
+        )
         
         # Check if we're done
         if response.stop_reason == "end_turn":
@@ -102,43 +414,32 @@ async def run_anthropic_agent(
             # Add assistant's response to messages
             messages.append({"role": "assistant", "content": response.content})
             
-            # Process each tool use
+            # Execute all tool uses from this turn concurrently via MCP
+            tool_blocks = [block for block in response.content if block.type == "tool_use"]
+            if guard.is_stuck([(block.name, block.input) for block in tool_blocks]):
+                return "Agent stopped repeating the same tool calls without completing the report."
+            results = await asyncio.gather(
+                *(execute_tool(session, block.name, block.input, tool_cache,
+                               tool_timeouts.get(block.name, tool_timeout_default))
+                  for block in tool_blocks)
+            )
+            
+            guard.record_results(any(is_error for _, is_error in results))
+            
             tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    tool_name = block.name
-                    tool_input = block.input
-                    tool_use_id = block.id
-                    
-                    logger.info(f"Executing tool: {tool_name} with input: {json.dumps(tool_input)}")
-                    
-                    # Execute tool via MCP
-                    try:
-                        result = await session.call_tool(tool_name, tool_input)
-                        # Extract text content from result
-                        result_text = ""
-                        for content in result.content:
-                            if hasattr(content, 'text'):
-                                result_text += content.text
-                        
-                        logger.info(f"Tool result: {result_text[:200]}...")
-                        
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": result_text
-                        })
-                    except Exception as e:
-                        logger.error(f"Tool execution failed: {e}")
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": f"Error: {str(e)}",
-                            "is_error": True
-                        })
+            for block, (result_text, is_error) in zip(tool_blocks, results):
+                tool_result = {
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": result_text
+                }
+                if is_error:
+                    tool_result["is_error"] = True
+                tool_results.append(tool_result)
             
             # Add tool results to messages
             messages.append({"role": "user", "content": tool_results})
+            _trim_tool_history(messages, history_budget_chars, keep_last=len(tool_results))
         else:
             # Unexpected stop reason
             logger.warning(f"Unexpected stop reason: {response.stop_reason}")
@@ -153,24 +454,31 @@ async def run_openai_agent(
     system_prompt: str,
     user_prompt: str,
     model: str,
-    max_iterations: int
+    max_iterations: int,
+    max_repeated_turns: int = 0,
+    tool_cache: Optional[dict] = None,
+    history_budget_chars: int = 0,
+    tool_timeouts: Optional[dict[str, float]] = None,
+    tool_timeout_default: Optional[float] = None
 ) -> str:
     """Run agentic loop with OpenAI GPT."""
-    import openai
-    
-    client = openai.OpenAI()
+    client = get_openai_sdk_client()
     openai_tools = mcp_tools_to_openai(tools)
     
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt}
     ]
+    guard = _RepeatedTurnGuard(max_repeated_turns)
+    tool_cache = {} if tool_cache is None else tool_cache
+    tool_timeouts = tool_timeouts or {}
     
     for iteration in range(max_iterations):
         logger.info(f"Iteration {iteration + 1}/{max_iterations}")
         
         # Call OpenAI
-        response = client.chat.completions.create(
+        response = await asyncio.to_thread(
+            client.chat.completions.create,
             model=model,
             messages=messages,
             tools=openai_tools,
@@ -191,35 +499,29 @@ async def run_openai_agent(
             # Add assistant's response to messages
             messages.append(message)
             
-            # Process each tool call
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_input = json.loads(tool_call.function.arguments)
-                
-                logger.info(f"Executing tool: {tool_name} with input: {json.dumps(tool_input)}")
-                
-                # Execute tool via MCP
-                try:
-                    result = await session.call_tool(tool_name, tool_input)
-                    result_text = ""
-                    for content in result.content:
-                        if hasattr(content, 'text'):
-                            result_text += content.text
-                    
-                    logger.info(f"Tool result: {result_text[:200]}...")
-                    
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": result_text
-                    })
-                except Exception as e:
-                    logger.error(f"Tool execution failed: {e}")
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": f"Error: {str(e)}"
-                    })
+            calls = [
+                (tool_call.function.name, json.loads(tool_call.function.arguments))
+                for tool_call in message.tool_calls
+            ]
+            if guard.is_stuck(calls):
+                return "Agent stopped repeating the same tool calls without completing the report."
+            
+            # Execute all tool calls from this turn concurrently via MCP;
+            # results are appended in call order so the IDs stay aligned
+            results = await asyncio.gather(*(
+                execute_tool(session, tool_name, tool_input, tool_cache,
+                             tool_timeouts.get(tool_name, tool_timeout_default))
+                for tool_name, tool_input in calls
+            ))
+            guard.record_results(any(is_error for _, is_error in results))
+            
+            for tool_call, (result_text, _) in zip(message.tool_calls, results):
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": result_text
+                })
+            _trim_tool_history(messages, history_budget_chars, keep_last=len(results))
         else:
             # Unexpected finish reason
             logger.warning(f"Unexpected finish reason: {finish_reason}")
@@ -236,6 +538,9 @@ async def generate_report(
     """
     Generate a report using an agentic AI with MCP tools.
     
+    The MCP session is pooled per server URL and kept open for later calls;
+    call close_mcp_sessions() when done.
+    
     Args:
         config: Agent configuration (MCP server URL, AI provider, model)
         system_prompt: System prompt for the AI
@@ -244,33 +549,59 @@ async def generate_report(
     Returns:
         The generated report as a string (markdown).
     """
-    logger.info(f"Connecting to MCP server at {config.mcp_server_url}")
-    
-    # Use Streamable HTTP transport (modern MCP protocol)
-    async with streamable_http_client(config.mcp_server_url) as (read_stream, write_stream, _):
-        async with ClientSession(read_stream, write_stream) as session:
-            # Initialize MCP session
-            await session.initialize()
-            logger.info("MCP session initialized")
-            
-            # Get available tools
-            tools_response = await session.list_tools()
-            tools = tools_response.tools
-            logger.info(f"Discovered {len(tools)} tools")
-            
-            # Run the appropriate agent
-            if config.ai_provider == "anthropic":
-                return await run_anthropic_agent(
-                    session, tools, system_prompt, user_prompt,
-                    config.model, config.max_iterations
-                )
-            elif config.ai_provider == "openai":
-                return await run_openai_agent(
-                    session, tools, system_prompt, user_prompt,
-                    config.model, config.max_iterations
-                )
-            else:
-                raise ValueError(f"Unsupported AI provider: {config.ai_provider}")
+    if config.ai_provider not in ("anthropic", "openai"):
+        raise ValueError(f"Unsupported AI provider: {config.ai_provider}")
+    
+    # Reuse the pooled session (and its tool list) for this server
+    session, tools = await _session_pool.acquire(config.mcp_server_url)
+    
+    tool_cache = start_speculative_tools(
+        session, config.speculative_tools, config.tool_timeouts, config.tool_timeout_default
+    )
+    
+    try:
+        # Run the appropriate agent
+        if config.ai_provider == "anthropic":
+            return await run_anthropic_agent(
+                session, tools, system_prompt, user_prompt,
+                config.model, config.max_iterations, config.max_repeated_turns, tool_cache,
+                config.history_budget_chars, config.tool_timeouts, config.tool_timeout_default
+            )
+        return await run_openai_agent(
+            session, tools, system_prompt, user_prompt,
+            config.model, config.max_iterations, config.max_repeated_turns, tool_cache,
+            config.history_budget_chars, config.tool_timeouts, config.tool_timeout_default
+        )
+    except Exception:
+        # The session may be broken; reconnect on the next call
+        await _session_pool.discard(config.mcp_server_url)
+        raise
+    finally:
+        # Drop speculative calls the agent never asked for
+        for task in tool_cache.values():
+            task.cancel()
+        await asyncio.gather(*tool_cache.values(), return_exceptions=True)
+
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the long-lived event loop used by the sync wrappers.
+    
+    It runs in a daemon thread, so pooled MCP sessions stay open between
+    generate_report_sync() calls instead of dying with a per-call asyncio.run().
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="agentic-report-loop", daemon=True
+            ).start()
+        return _sync_loop
 
 
 def generate_report_sync(
@@ -278,5 +609,14 @@ def generate_report_sync(
     system_prompt: str,
     user_prompt: str
 ) -> str:
-    """Synchronous wrapper for generate_report."""
-    return asyncio.run(generate_report(config, system_prompt, user_prompt))
+    """Synchronous wrapper for generate_report (runs on a shared background loop)."""
+    future = asyncio.run_coroutine_threadsafe(
+        generate_report(config, system_prompt, user_prompt), _get_sync_loop()
+    )
+    return future.result()
+
+
+def close_mcp_sessions_sync():
+    """Synchronous wrapper for close_mcp_sessions."""
+    if _sync_loop is not None:
+        asyncio.run_coroutine_threadsafe(close_mcp_sessions(), _sync_loop).result()
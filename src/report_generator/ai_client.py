@@ -12,12 +12,32 @@ Usage:
 
 import os
 import logging
+import functools
 from abc import ABC, abstractmethod
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def get_openai_sdk_client(api_key: Optional[str] = None):
+    """
+    Return a shared OpenAI SDK client for api_key (default: from environment).
+    
+    The SDK is imported on first use, and the client (with its HTTP
+    connection pool) is reused across report generations.
+    """
+    import openai
+    return openai.OpenAI(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=None)
+def get_anthropic_sdk_client(api_key: Optional[str] = None):
+    """Return a shared Anthropic SDK client for api_key (default: from environment)."""
+    import anthropic
+    return anthropic.Anthropic(api_key=api_key)
+
+
 class AIClient(ABC):
     """Abstract base class for AI providers."""
     
@@ -36,9 +56,8 @@ class OpenAIClient(AIClient):
             raise ValueError("OPENAI_API_KEY environment variable is required")
         self.model = model
         
-        # Import here to avoid requiring openai if not used
-        import openai
-        self.client = openai.OpenAI(api_key=self.api_key)
+        # Imported on first use to avoid requiring openai if not used
+        self.client = get_openai_sdk_client(self.api_key)
     
     def generate(self, prompt: str) -> str:
         """Generate a response using OpenAI API."""
@@ -67,9 +86,8 @@ class AnthropicClient(AIClient):
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
         self.model = model
         
-        # Import here to avoid requiring anthropic if not used
-        import anthropic
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Imported on first use to avoid requiring anthropic if not used
+        self.client = get_anthropic_sdk_client(self.api_key)
     
     def generate(self, prompt: str) -> str:
         """Generate a response using Anthropic API."""
@@ -0,0 +1,122 @@
+"""
+Anthropic SDK patches for the report agents.
+
+mcp-agent's AnthropicAugmentedLLM builds the SDK client and request itself and
+does not expose hooks for either, so (like setup_ibkr_environment in
+__main__.py) we patch the SDK at startup:
+
+- Prompt caching: the agent instruction is sent as a plain string `system`
+  parameter on every turn of the tool-use loop. The report system prompts are
+  large and static, as are the tool schemas, so Messages.create is patched to
+  mark both as cacheable. Turns after the first (and re-runs within the cache
+  TTL) then only pay full price for the new tokens.
+- Shared HTTP client: mcp-agent creates a new Anthropic client (and
+  connection pool) per request, re-doing the TLS handshake to the API each
+  turn. get_shared_http_client() provides one pooled client that the report's
+  LLM class passes explicitly to the clients it creates.
+"""
+
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _with_cache_control(kwargs: dict) -> dict:
+    """
+    Mark the tool definitions and system prompt as cacheable.
+
+    The request prefix is tools, then system, then messages. A breakpoint on
+    the last tool caches the tool schemas; one on the system block caches
+    tools + system together.
+    """
+    tools = kwargs.get("tools")
+    if tools and isinstance(tools[-1], dict) and "cache_control" not in tools[-1]:
+        kwargs["tools"] = [*tools[:-1], {**tools[-1], "cache_control": CACHE_CONTROL}]
+
+    system = kwargs.get("system")
+    if isinstance(system, str) and system:
+        kwargs["system"] = [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+    return kwargs
+
+
+def _log_cache_usage(response):
+    """Log prompt cache reads/writes so cache hits can be verified."""
+    usage = getattr(response, "usage", None)
+    if usage is not None and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Prompt cache: %s tokens written, %s tokens read, %s uncached input tokens",
+            getattr(usage, "cache_creation_input_tokens", None),
+            getattr(usage, "cache_read_input_tokens", None),
+            getattr(usage, "input_tokens", None),
+        )
+    return response
+
+
+def enable_prompt_caching():
+    """
+    Patch Messages.create / AsyncMessages.create to add cache_control to the tools and system prompt.
+
+    Safe to call more than once; the patch is only applied once.
+    """
+    try:
+        from anthropic.resources.messages import Messages, AsyncMessages
+    except ImportError as e:
+        logger.warning(f"Could not enable prompt caching: {e}")
+        return
+
+    if getattr(Messages.create, "_prompt_caching", False):
+        return
+
+    original_create = Messages.create
+    original_async_create = AsyncMessages.create
+
+    @functools.wraps(original_create)
+    def create(self, *args, **kwargs):
+        return _log_cache_usage(original_create(self, *args, **_with_cache_control(kwargs)))
+
+    @functools.wraps(original_async_create)
+    async def async_create(self, *args, **kwargs):
+        return _log_cache_usage(await original_async_create(self, *args, **_with_cache_control(kwargs)))
+
+    create._prompt_caching = True
+    async_create._prompt_caching = True
+    Messages.create = create
+    AsyncMessages.create = async_create
+
+    logger.info("Enabled Anthropic prompt caching for tools and system prompts")
+
+
+# One pooled HTTP client for the report's Anthropic requests (see get_shared_http_client)
+_http_client = None
+
+
+def get_shared_http_client():
+    """
+    Return the pooled HTTP client for Anthropic requests, creating it on first use.
+
+    It is a sync client: requests are sent from worker threads, and unlike an
+    async client it is not bound to an event loop, so it stays usable across
+    asyncio.run() calls. Pass it explicitly (Anthropic(http_client=...)) and
+    do not close those SDK clients, since that would close the shared pool;
+    close_shared_http_client() closes it at shutdown.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import anthropic
+        import httpx
+
+        _http_client = anthropic.DefaultHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=300)
+        )
+    return _http_client
+
+
+def close_shared_http_client():
+    """Close the shared HTTP client (no-op if it was never created)."""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        client.close()
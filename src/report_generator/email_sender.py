@@ -16,12 +16,16 @@ Configuration via environment variables:
 """
 
 import os
+import asyncio
+import functools
 import smtplib
 import logging
+import threading
 import markdown
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,46 @@ EMAIL_HTML_TEMPLATE = """<!DOCTYPE html>
 </body>
 </html>"""
 
+# EMAIL_HTML_TEMPLATE split around {body} (CSS braces unescaped), so rendering
+# is plain concatenation instead of a str.format() scan of the whole template
+_HTML_HEAD, _HTML_TAIL = (
+    part.replace("{{", "{").replace("}}", "}") for part in EMAIL_HTML_TEMPLATE.split("{body}")
+)
+
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code', 'nl2br']
+
+# Loading markdown extensions costs more than a single conversion, so each
+# thread keeps one configured converter and resets it between documents
+_markdown_local = threading.local()
+
+
+# Bodies larger than this are rendered every time rather than kept in memory
+MAX_CACHED_BODY_CHARS = 256 * 1024
+
+
+def _convert_markdown(body: str) -> str:
+    converter = getattr(_markdown_local, "converter", None)
+    if converter is None:
+        converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        _markdown_local.converter = converter
+    html_body = converter.reset().convert(body)
+    return _HTML_HEAD + html_body + _HTML_TAIL
+
+
+_convert_markdown_cached = functools.lru_cache(maxsize=16)(_convert_markdown)
+
+
+def render_markdown(body: str) -> str:
+    """
+    Render a markdown body into the full HTML email document.
+    
+    Results are memoised, so sending the same report to several recipients
+    (or re-sending it) converts it once.
+    """
+    if len(body) > MAX_CACHED_BODY_CHARS:
+        return _convert_markdown(body)
+    return _convert_markdown_cached(body)
+
 
 class EmailSender:
     """Gmail SMTP email sender with markdown support."""
@@ -70,6 +114,54 @@ class EmailSender:
             raise ValueError("SENDER_EMAIL environment variable is required")
         if not self.receiver_email:
             raise ValueError("RECEIVER_EMAIL environment variable is required")
+        
+        # Authenticated SMTP session, opened on first send and reused after
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+    
+    def _get_connection(self) -> smtplib.SMTP:
+        """Return the open SMTP session, reconnecting if the server dropped it."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPException:
+                pass
+            self.close()
+        
+        logger.info("Connecting to %s:%s", self.smtp_server, self.smtp_port)
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.sender_email, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+    
+    def connect(self):
+        """Open (or verify) the SMTP session ahead of the first send."""
+        with self._smtp_lock:
+            self._get_connection()
+    
+    def close(self):
+        """Close the SMTP session if open."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            self._smtp.close()
+        finally:
+            self._smtp = None
+    
+    def __enter__(self) -> "EmailSender":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        with self._smtp_lock:
+            self.close()
     
     def _parse_recipients(self, emails: Union[str, List[str]]) -> List[str]:
         """
@@ -89,7 +181,8 @@ class EmailSender:
         subject: str,
         body: str,
         content_type: str = "plain",
-        receiver_email: Optional[Union[str, List[str]]] = None
+        receiver_email: Optional[Union[str, List[str]]] = None,
+        rendered_html: Optional[str] = None
     ) -> bool:
         """
         Send an email via SMTP.
@@ -99,13 +192,14 @@ class EmailSender:
             body: Email body content
             content_type: One of "plain", "html", or "markdown"
             receiver_email: Override default receiver(s) (optional), can be comma-separated
+            rendered_html: Pre-rendered HTML for a markdown body (skips conversion)
         
         Returns:
             True if email sent successfully, False otherwise
         """
         recipients = self._parse_recipients(receiver_email or self.receiver_email)
         
-        logger.info(f"Sending email to {recipients}, subject: {subject}, type: {content_type}")
+        logger.info("Sending email to %s, subject: %s, type: %s", recipients, subject, content_type)
         
         try:
             msg = MIMEMultipart("alternative")
@@ -115,8 +209,7 @@ class EmailSender:
             
             if content_type == "markdown":
                 # Convert markdown to HTML using the markdown library
-                html_body = markdown.markdown(body, extensions=['tables', 'fenced_code', 'nl2br'])
-                full_html = EMAIL_HTML_TEMPLATE.format(body=html_body)
+                full_html = rendered_html or render_markdown(body)
                 msg.attach(MIMEText(body, "plain"))  # Plain text fallback
                 msg.attach(MIMEText(full_html, "html"))
             elif content_type == "html":
@@ -124,24 +217,122 @@ class EmailSender:
             else:
                 msg.attach(MIMEText(body, "plain"))
             
-            logger.info(f"Connecting to {self.smtp_server}:{self.smtp_port}")
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.smtp_password)
+            with self._smtp_lock:
+                server = self._get_connection()
                 server.sendmail(self.sender_email, recipients, msg.as_string())
             
-            logger.info(f"Email sent successfully to {len(recipients)} recipient(s)")
+            logger.info("Email sent successfully to %d recipient(s)", len(recipients))
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            logger.error("Failed to send email: %s", e)
+            # Drop a possibly broken session so the next send reconnects
+            with self._smtp_lock:
+                self.close()
             return False
+    
+    def send_email_batch(
+        self,
+        messages: List[Tuple[str, str, str]],
+        content_type: str = "markdown",
+        max_workers: int = 5
+    ) -> List[bool]:
+        """
+        Send several emails over parallel SMTP sessions.
+        
+        Each worker thread logs in once and reuses its session for every
+        message it sends, so login/TLS is paid per worker rather than per email.
+        
+        Args:
+            messages: (subject, body, recipient) tuples; recipient may be comma-separated
+            content_type: One of "plain", "html", or "markdown"
+            max_workers: Maximum number of concurrent SMTP sessions
+        
+        Returns:
+            One success flag per message, in order
+        """
+        if not messages:
+            return []
+        
+        local = threading.local()
+        senders: List[EmailSender] = []
+        senders_lock = threading.Lock()
+        
+        def send(message: Tuple[str, str, str]) -> bool:
+            sender = getattr(local, "sender", None)
+            if sender is None:
+                sender = local.sender = EmailSender(
+                    self.smtp_server, self.smtp_port, self.smtp_password,
+                    self.sender_email, self.receiver_email
+                )
+                with senders_lock:
+                    senders.append(sender)
+            subject, body, recipient = message
+            return sender.send_email(subject, body, content_type, receiver_email=recipient)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(messages), max_workers)) as executor:
+                return list(executor.map(send, messages))
+        finally:
+            for sender in senders:
+                sender.close()
+
+
+_default_sender: Optional[EmailSender] = None
+
 
+def get_default_sender() -> EmailSender:
+    """Get or create the environment-configured sender shared by report sends."""
+    global _default_sender
+    if _default_sender is None:
+        _default_sender = EmailSender()
+    return _default_sender
 
-def send_report_email(subject: str, body: str, content_type: str = "markdown") -> bool:
+
+def close_default_sender():
+    """Close the shared sender's SMTP session, if any."""
+    if _default_sender is not None:
+        _default_sender.close()
+
+
+def send_report_email(
+    subject: str,
+    body: str,
+    content_type: str = "markdown",
+    rendered_html: Optional[str] = None
+) -> bool:
     """
     Convenience function to send a report email.
     Default content type is markdown since AI reports are typically in markdown.
     """
-    sender = EmailSender()
-    return sender.send_email(subject, body, content_type)
+    return get_default_sender().send_email(subject, body, content_type, rendered_html=rendered_html)
+
+
+async def send_report_email_async(
+    subject: str,
+    body: str,
+    content_type: str = "markdown",
+    rendered_html: Optional[str] = None
+) -> bool:
+    """
+    Async variant of send_report_email.
+
+    smtplib is blocking, so the send runs in a worker thread and the event
+    loop stays free for any report generation still in flight.
+    """
+    return await asyncio.to_thread(send_report_email, subject, body, content_type, rendered_html)
+
+
+async def warm_up_email_sender() -> bool:
+    """
+    Open the shared sender's SMTP session in a worker thread ahead of sending.
+    
+    Failures are logged rather than raised; send_email() reconnects (and
+    reports the real error) when the report is sent.
+    """
+    try:
+        await asyncio.to_thread(lambda: get_default_sender().connect())
+        return True
+    except Exception as e:
+        logger.warning("SMTP warm-up failed, will retry on send: %s", e)
+        return False
@@ -0,0 +1,96 @@
+"""
+On-disk cache for generated report content.
+
+Re-running the generator for the same period (cron retries, manual re-sends)
+would otherwise pay for the full LLM run again. Entries are plain files named
+by a caller-supplied key and expire after a TTL based on file mtime; expired
+entries are pruned on every write.
+
+Configuration via environment variables:
+- REPORT_CACHE_DIR: Cache directory (default: ~/.cache/family-finance/reports)
+- REPORT_CACHE_TTL_HOURS: Entry lifetime in hours (default: 24, 0 disables the cache)
+"""
+
+import os
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """File-backed cache with atomic writes and mtime-based expiry."""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_hours: Optional[float] = None):
+        self.cache_dir = Path(
+            cache_dir
+            or os.environ.get("REPORT_CACHE_DIR")
+            or Path.home() / ".cache" / "family-finance" / "reports"
+        )
+        if ttl_hours is None:
+            ttl_hours = float(os.environ.get("REPORT_CACHE_TTL_HOURS", "24"))
+        self.ttl_seconds = ttl_hours * 3600
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the given strings (order-sensitive)."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str, suffix: str = ".md") -> Path:
+        """Location of the entry for key (it may not exist)."""
+        return self.cache_dir / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = ".md") -> Optional[str]:
+        """Return cached content for key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+
+        path = self.path(key, suffix)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read report cache entry {path}: {e}")
+            return None
+
+    def put(self, key: str, content: str, suffix: str = ".md") -> Optional[Path]:
+        """Atomically store content under key. Cache failures are logged, not raised."""
+        if not self.enabled:
+            return None
+
+        path = self.path(key, suffix)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+            self._prune()
+            return path
+        except OSError as e:
+            logger.warning(f"Could not write report cache entry {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return None
+
+    def _prune(self):
+        """Delete expired entries so the cache directory does not grow without bound."""
+        cutoff = time.time() - self.ttl_seconds
+        for entry in self.cache_dir.iterdir():
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    entry.unlink()
+            except OSError:
+                continue
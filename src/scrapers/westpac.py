@@ -9,16 +9,19 @@ Environment Variables:
     HEADLESS: Set to "true" for headless mode (default: true)
     SLOW_MO: Milliseconds to slow down actions (default: 0 in headless, 500 in visible)
     SCREENSHOT_DIR: Directory for screenshots (default: data/scraper_state/screenshots)
+    DEBUG_SCREENSHOTS: Set to "true" to also capture progress screenshots on successful runs (default: false)
     DOWNLOAD_DIR: Directory for downloaded files (default: incoming/westpac-homeloan-offset)
     LOCK_DIR: Directory for lock files (default: data/scraper_state)
+    PROFILE_DIR: Persistent browser profile directory (default: data/scraper_state/westpac_profile)
     RANDOM_DELAY: Set to "true" to enable random delay before scraping (default: false)
-    MAX_DELAY_HOURS: Maximum hours to delay when RANDOM_DELAY is enabled (default: 24)
+    MAX_DELAY_HOURS: Maximum hours to delay when RANDOM_DELAY is enabled (default: 12)
 
 What it does:
-1. Opens browser (headless by default for automation)
+1. Opens browser (headless by default for automation) with a persistent profile
 2. Goes to Westpac login page
 3. Fills in Customer ID and Password from environment
 4. Clicks "Sign in"
+   (steps 2-5 are skipped when the saved profile still has a live session)
 5. Navigates to export page
 6. Selects all accounts and exports last 7 days as CSV
 
@@ -40,16 +43,19 @@ import argparse
 import asyncio
 import logging
 import os
-import random
+import re
+import secrets
+import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 # Load .env file if present
 from dotenv import load_dotenv
 load_dotenv()
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import async_playwright, expect, TimeoutError as PlaywrightTimeout
 
 # Configure logging
 logging.basicConfig(
@@ -62,6 +68,13 @@ logger = logging.getLogger(__name__)
 # Lock file configuration
 LOCK_FILE_NAME = "westpac.lock"
 
+LOGIN_URL = "https://banking.westpac.com.au/wbc/banking/handler?TAM_OP=login&segment=personal&logout=false"
+EXPORT_URL = "https://banking.westpac.com.au/secure/banking/reportsandexports/exportparameters/2/"
+
+# Requests aborted on every page load (images, fonts, media and trackers)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
+
 
 def get_lock_file_path() -> Path:
     """Get the path to the lock file."""
@@ -124,16 +137,23 @@ def parse_args():
         default=int(os.getenv("SLOW_MO", "0")),
         help="Slow down actions by N milliseconds"
     )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        default=os.getenv("DEBUG_SCREENSHOTS", "false").lower() == "true",
+        help="Capture a screenshot after every step, not only on failure"
+    )
     return parser.parse_args()
 
 
-async def scrape_westpac(headless: bool = True, slow_mo: int = 0) -> bool:
+async def scrape_westpac(headless: bool = True, slow_mo: int = 0, debug: bool = False) -> bool:
     """
     Scrape Westpac and download transaction CSV.
     
     Args:
         headless: Run browser in headless mode
         slow_mo: Milliseconds to slow down actions
+        debug: Capture progress screenshots (failure screenshots are always taken)
         
     Returns:
         True if successful, False otherwise
@@ -151,145 +171,212 @@ async def scrape_westpac(headless: bool = True, slow_mo: int = 0) -> bool:
     # Get directories from environment or use defaults
     screenshot_dir = Path(os.getenv("SCREENSHOT_DIR", "data/scraper_state/screenshots"))
     download_dir = Path(os.getenv("DOWNLOAD_DIR", "incoming/westpac-homeloan-offset"))
+    profile_dir = Path(os.getenv("PROFILE_DIR", "data/scraper_state/westpac_profile"))
     
     # Create directories
     screenshot_dir.mkdir(parents=True, exist_ok=True)
     download_dir.mkdir(parents=True, exist_ok=True)
+    profile_dir.mkdir(parents=True, exist_ok=True)
     
     # Start Playwright
     async with async_playwright() as p:
-        # Launch browser with consistent settings
-        logger.info(f"Launching browser (headless={headless}, slow_mo={slow_mo}ms)...")
-        browser = await p.chromium.launch(
+        # Launch browser with a persistent profile so cookies, cache and local
+        # storage survive between runs (a live session skips the login steps).
+        # These settings match a typical Linux desktop Chrome browser
+        logger.info(f"Launching browser (headless={headless}, slow_mo={slow_mo}ms, profile={profile_dir})...")
+        context = await p.chromium.launch_persistent_context(
+            user_data_dir=str(profile_dir),
             headless=headless,
             slow_mo=slow_mo,
+            accept_downloads=True,
+            # Keep Playwright's temp downloads on the same filesystem as
+            # download_dir so the final move is a rename (the watcher only
+            # picks up *.csv, and temp files have no extension)
+            downloads_path=str(download_dir / ".downloads"),
             args=[
                 '--no-sandbox',
                 '--disable-setuid-sandbox',
                 '--disable-blink-features=AutomationControlled',  # Hide automation
-            ]
+                # Single-page scrape: skip the browser features it never uses
+                '--disable-dev-shm-usage',
+                '--disable-gpu',
+                '--disable-extensions',
+                '--disable-background-networking',
+                '--disable-background-timer-throttling',
+                '--disable-renderer-backgrounding',
+                '--disable-features=TranslateUI',
+                '--no-first-run',
+                '--no-default-browser-check',
+                '--mute-audio',
+                '--metrics-recording-only',
+                '--no-pings',
+            ],
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+            locale='en-AU',
+            timezone_id='Australia/Sydney',
+            # Disable webdriver detection
+            extra_http_headers={
+                'Accept-Language': 'en-AU,en;q=0.9',
+            }
         )
         
+        # Abort requests the scrape never reads. Stylesheets are kept because
+        # the visibility waits depend on layout
+        async def block_unneeded(route):
+            request = route.request
+            if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+                host in request.url for host in BLOCKED_HOSTS
+            ):
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        await context.route("**/*", block_unneeded)
+        
+        # Progress screenshots are debug artifacts, only taken with --debug; capture
+        # them in the background so PNG encoding overlaps with the next action
+        screenshot_tasks: list[asyncio.Task] = []
+        
+        def take_screenshot(filename: str):
+            if not debug:
+                return
+            screenshot_tasks.append(asyncio.create_task(
+                page.screenshot(path=str(screenshot_dir / filename))
+            ))
+        
         try:
-            # Create a new browser context with consistent settings
-            # These settings match a typical Linux desktop Chrome browser
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                locale='en-AU',
-                timezone_id='Australia/Sydney',
-                # Disable webdriver detection
-                extra_http_headers={
-                    'Accept-Language': 'en-AU,en;q=0.9',
-                }
-            )
-            
-            # Create a new page from the context
-            page = await context.new_page()
-            
-            # Step 1: Navigate to login page
-            logger.info("Step 1: Navigating to Westpac login page...")
-            await page.goto(
-                "https://banking.westpac.com.au/wbc/banking/handler?"
-                "TAM_OP=login&segment=personal&logout=false",
-                timeout=60000
+            # A persistent context opens with a blank page already
+            page = context.pages[0] if context.pages else await context.new_page()
+            
+            # Every element the flow touches, defined once (locators are lazy,
+            # so building them up front costs nothing)
+            loc = SimpleNamespace(
+                customer_id=page.locator("#fakeusername"),
+                password=page.locator('input[type="password"]'),
+                sign_in=page.get_by_role("button", name="Sign in"),
+                select_multiple=page.locator("a.select-multiple"),
+                select_all=page.locator("#_selectall"),
+                continue_btn=page.locator("button.btn-submit.btn-primary"),
+                preset_range=page.locator("a.flyout-launcher.picker-text"),
+                last_7_days=page.locator("a.link-icon.icon-arrow").filter(has_text="Last 7 days"),
+                export_btn=page.locator("button.export-link.btn-primary"),
             )
             
-            # Wait for page to load
-            await page.wait_for_load_state("networkidle", timeout=30000)
-            logger.info("Login page loaded")
-            
-            # Step 2: Find and fill Customer ID
-            logger.info("Step 2: Filling Customer ID...")
-            customer_id_field = page.locator("#fakeusername")
-            await customer_id_field.fill(customer_id)
-            logger.info("Customer ID entered")
-            
-            # Step 3: Find and fill Password
-            logger.info("Step 3: Filling Password...")
-            password_field = page.locator('input[type="password"]')
-            await password_field.fill(password)
-            logger.info("Password entered")
-            
-            # Step 4: Click Sign in button
-            logger.info("Step 4: Clicking Sign in...")
-            sign_in_button = page.get_by_role("button", name="Sign in")
-            await sign_in_button.click()
-            logger.info("Sign in clicked")
-            
-            # Wait for login to complete
-            logger.info("Waiting for login to complete...")
-            await page.wait_for_load_state("networkidle", timeout=60000)
-            await asyncio.sleep(3)  # Extra wait for any redirects
-            
-            logger.info(f"Current URL after login: {page.url}")
-            
-            # Check for login errors
-            if "error" in page.url.lower() or "login" in page.url.lower():
-                await page.screenshot(path=str(screenshot_dir / "westpac_login_error.png"))
-                logger.error("Login may have failed - still on login page")
-                return False
-            
-            # Step 5: Navigate to export page
-            logger.info("Step 5: Navigating to export page...")
-            await page.goto(
-                "https://banking.westpac.com.au/secure/banking/reportsandexports/exportparameters/2/",
-                timeout=60000
-            )
-            await page.wait_for_load_state("networkidle", timeout=30000)
+            # With a live session in the saved profile, the export page opens
+            # directly and Steps 1-5 are skipped
+            logger.info("Checking for a live session on the export page...")
+            await page.goto(EXPORT_URL, wait_until="domcontentloaded", timeout=60000)
+            logged_in = False
+            if "/secure/" in page.url:
+                try:
+                    await loc.select_multiple.wait_for(state="visible", timeout=10000)
+                    logged_in = True
+                except PlaywrightTimeout:
+                    pass
+            
+            if logged_in:
+                logger.info(f"Already logged in (URL: {page.url}), skipping Steps 1-5")
+            else:
+                # Step 1: Navigate to login page
+                logger.info("Step 1: Navigating to Westpac login page...")
+                await page.goto(LOGIN_URL, timeout=60000)
+                
+                # Wait for the login form itself rather than for the network to go idle
+                await loc.customer_id.wait_for(state="visible", timeout=30000)
+                logger.info("Login page loaded")
+                
+                # Step 2: Find and fill Customer ID
+                logger.info("Step 2: Filling Customer ID...")
+                await loc.customer_id.fill(customer_id)
+                logger.info("Customer ID entered")
+                
+                # Step 3: Find and fill Password
+                logger.info("Step 3: Filling Password...")
+                await loc.password.fill(password)
+                logger.info("Password entered")
+                
+                # Step 4: Click Sign in button
+                logger.info("Step 4: Clicking Sign in...")
+                await loc.sign_in.click()
+                logger.info("Sign in clicked")
+                
+                # Wait for login to complete (redirect into the secure area)
+                logger.info("Waiting for login to complete...")
+                try:
+                    await page.wait_for_url(re.compile(r"/secure/"), timeout=60000)
+                except PlaywrightTimeout:
+                    pass  # Reported by the login error check below
+                
+                logger.info(f"Current URL after login: {page.url}")
+                
+                # Check for login errors
+                if "error" in page.url.lower() or "login" in page.url.lower():
+                    await page.screenshot(path=str(screenshot_dir / "westpac_login_error.png"))
+                    logger.error("Login may have failed - still on login page")
+                    return False
+                
+                # Step 5: Navigate to export page
+                logger.info("Step 5: Navigating to export page...")
+                await page.goto(
+                    EXPORT_URL,
+                    wait_until="domcontentloaded",  # the element wait below gates the next step
+                    timeout=60000
+                )
+            
+            await loc.select_multiple.wait_for(state="visible", timeout=30000)
             logger.info("Export page loaded")
             
             # Take a screenshot
-            await page.screenshot(path=str(screenshot_dir / "westpac_export_page.png"))
-            logger.debug(f"Screenshot saved: {screenshot_dir / 'westpac_export_page.png'}")
+            take_screenshot("westpac_export_page.png")
             
             # Step 6: Click "Select multiple" link to open the popup
             logger.info("Step 6: Clicking 'Select multiple' link...")
-            await page.locator("a.select-multiple").click()
-            await asyncio.sleep(1)
+            await loc.select_multiple.click()
+            await loc.select_all.wait_for(state="visible", timeout=30000)
             
             # Take screenshot to see popup
-            await page.screenshot(path=str(screenshot_dir / "westpac_select_multiple_popup.png"))
+            take_screenshot("westpac_select_multiple_popup.png")
             
             # Step 7: Click the "Select" checkbox (first checkbox - selects all)
             logger.info("Step 7: Clicking 'Select' checkbox to select all accounts...")
-            await page.locator("#_selectall").click()
-            await asyncio.sleep(0.5)
+            await loc.select_all.click()
+            # Continue is only meaningful once the selection has registered
+            await expect(loc.select_all).to_be_checked(timeout=5000)
             logger.info("Select all checkbox clicked")
             
             # Take screenshot
-            await page.screenshot(path=str(screenshot_dir / "westpac_all_selected.png"))
+            take_screenshot("westpac_all_selected.png")
             
             # Step 8: Click "Continue" button
             logger.info("Step 8: Clicking 'Continue' button...")
-            await page.locator("button.btn-submit.btn-primary").click()
-            await asyncio.sleep(1)
+            await loc.continue_btn.click()
+            await loc.preset_range.wait_for(state="visible", timeout=30000)
             logger.info("Continue clicked")
             
             # Take screenshot to see result
-            await page.screenshot(path=str(screenshot_dir / "westpac_accounts_selected.png"))
+            take_screenshot("westpac_accounts_selected.png")
             
             # Step 9: Select date range - "Last 7 days"
             logger.info("Step 9: Selecting date range 'Last 7 days'...")
             
             # Click "a preset range" link to open the dropdown
-            await page.locator("a.flyout-launcher.picker-text").click()
-            await asyncio.sleep(0.5)
+            # (Playwright's click waits for each element to be visible and actionable)
+            await loc.preset_range.click()
             
             # Click "Last 7 days" option
-            await page.locator("a.link-icon.icon-arrow").filter(has_text="Last 7 days").click()
-            await asyncio.sleep(0.5)
+            await loc.last_7_days.click()
             logger.info("Date range selected: Last 7 days")
             
             # Take screenshot
-            await page.screenshot(path=str(screenshot_dir / "westpac_date_selected.png"))
+            take_screenshot("westpac_date_selected.png")
             
             # Step 10: Click Export and download CSV
             logger.info("Step 10: Clicking Export button and downloading CSV...")
             
             # Use expect_download to capture the file
             async with page.expect_download(timeout=30000) as download_info:
-                await page.locator("button.export-link.btn-primary").click()
+                await loc.export_btn.click()
                 logger.info("Clicked Export button, waiting for download...")
             
             download = await download_info.value
@@ -299,12 +386,20 @@ async def scrape_westpac(headless: bool = True, slow_mo: int = 0) -> bool:
             filename = f"westpac_export_{timestamp}.csv"
             save_path = download_dir / filename
             
-            # Save the file
-            await download.save_as(str(save_path))
+            # Move Playwright's finished temp file into place rather than copying
+            # it; the rename is atomic, so the watcher never sees a partial CSV
+            temp_path = await download.path()
+            try:
+                os.replace(temp_path, save_path)
+            except OSError:
+                # Different filesystem: copy next to the target, then rename
+                partial_path = save_path.with_suffix(".csv.part")
+                shutil.copyfile(temp_path, partial_path)
+                os.replace(partial_path, save_path)
             logger.info(f"Downloaded: {save_path}")
             
             # Take final screenshot
-            await page.screenshot(path=str(screenshot_dir / "westpac_export_complete.png"))
+            take_screenshot("westpac_export_complete.png")
             
             logger.info(f"Export complete! File saved to: {save_path}")
             
@@ -327,30 +422,21 @@ async def scrape_westpac(headless: bool = True, slow_mo: int = 0) -> bool:
             return False
             
         finally:
-            # Close browser
+            # Let pending screenshots finish (failures don't matter) before closing
+            if screenshot_tasks:
+                await asyncio.gather(*screenshot_tasks, return_exceptions=True)
+            
+            # Close browser (the profile is flushed to profile_dir)
             logger.info("Closing browser...")
-            await browser.close()
+            await context.close()
 
 
 async def main():
     """Main entry point."""
     args = parse_args()
     
-    # Add random delay if RANDOM_DELAY environment variable is set
-    random_delay_enabled = os.getenv("RANDOM_DELAY", "false").lower() == "true"
-    if random_delay_enabled:
-        # Random delay between 0 and MAX_DELAY_HOURS (default: 12 hours)
-        # This adds unpredictability to scraping time
-        max_delay_hours = int(os.getenv("MAX_DELAY_HOURS", "12"))
-        max_delay_seconds = max_delay_hours * 3600
-        delay_seconds = random.randint(0, max_delay_seconds)
-        delay_hours = delay_seconds / 3600
-        delay_minutes = (delay_seconds % 3600) / 60
-        logger.info(f"Random delay enabled: waiting {int(delay_hours)}h {int(delay_minutes)}m ({delay_seconds}s) before running...")
-        await asyncio.sleep(delay_seconds)
-        logger.info("Random delay complete, starting scraper...")
-    
-    # Check for lock file FIRST - refuse to run if locked
+    # Check for lock file FIRST - refuse to run if locked (before any random
+    # delay, so a locked scraper exits instead of idling for hours)
     if is_locked():
         lock_path = get_lock_file_path()
         logger.error("=" * 60)
@@ -371,11 +457,35 @@ async def main():
         logger.error("=" * 60)
         sys.exit(2)  # Exit code 2 = locked
     
+    # Add random delay if RANDOM_DELAY environment variable is set
+    random_delay_enabled = os.getenv("RANDOM_DELAY", "false").lower() == "true"
+    if random_delay_enabled:
+        # Random delay between 0 and MAX_DELAY_HOURS (default: 12 hours)
+        # This adds unpredictability to scraping time
+        max_delay_hours = int(os.getenv("MAX_DELAY_HOURS", "12"))
+        # Whole minutes are plenty of jitter; secrets keeps it unpredictable
+        delay_seconds = secrets.randbelow(max_delay_hours * 60 + 1) * 60
+        delay_hours = delay_seconds / 3600
+        delay_minutes = (delay_seconds % 3600) / 60
+        logger.info(f"Random delay enabled: waiting {int(delay_hours)}h {int(delay_minutes)}m ({delay_seconds}s) before running...")
+        await asyncio.sleep(delay_seconds)
+        logger.info("Random delay complete, starting scraper...")
+        
+        # Another run may have failed and locked the scraper while we slept
+        if is_locked():
+            logger.error("=" * 60)
+            logger.error("SCRAPER WAS LOCKED during the random delay - Not running")
+            logger.error("=" * 60)
+            logger.error(f"Lock file exists: {get_lock_file_path()}")
+            logger.error("The scraper will NOT run to prevent account lockout.")
+            logger.error("=" * 60)
+            sys.exit(2)  # Exit code 2 = locked
+    
     # --visible overrides --headless
     headless = not args.visible if args.visible else args.headless
     slow_mo = args.slow_mo if args.slow_mo else (500 if not headless else 0)
     
-    success = await scrape_westpac(headless=headless, slow_mo=slow_mo)
+    success = await scrape_westpac(headless=headless, slow_mo=slow_mo, debug=args.debug)
     
     if success:
         logger.info("Scraper completed successfully")
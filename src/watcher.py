@@ -11,12 +11,22 @@ Usage:
 Environment Variables:
     WATCH_DIR: Directory to watch for new CSV files (default: ./incoming)
     DATA_DIR: Directory for database and processed files (default: ./data)
-    POLL_INTERVAL: Seconds between folder scans (default: 30)
+    POLL_INTERVAL: Seconds between folder scans in polling mode (default: 30)
+    WATCH_POLL: Set to "true" to poll even when inotify is available (default: false)
+
+On Linux with the optional watchdog package installed, new files are picked up
+from inotify events as soon as they are complete (a file written in place, or
+renamed into place inside the watch directory). A file moved in from outside
+the watch tree only produces a "created" event, so a safety rescan still runs
+after POLL_INTERVAL seconds without events and picks such files up once their
+size has settled. Use polling for network filesystems, which do not deliver
+inotify events.
 """
 
 import argparse
 import logging
 import os
+import queue
 import shutil
 import sys
 import time
@@ -30,6 +40,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.parsers import ParserFactory
 from src.database import get_repository
 
+try:
+    from watchdog.events import PatternMatchingEventHandler
+    from watchdog.observers.inotify import InotifyObserver
+    WATCHDOG_AVAILABLE = True
+except Exception:
+    # ImportError without watchdog; the inotify backend raises its own error
+    # (e.g. UnsupportedLibcError) on platforms without inotify. Poll instead.
+    WATCHDOG_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,6 +60,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Event mode: quiet period that ends a burst of file events, and the most
+# files committed together
+EVENT_DEBOUNCE_SECONDS = 0.5
+EVENT_BATCH_MAX = 200
+
+
+if WATCHDOG_AVAILABLE:
+    class _CSVEventHandler(PatternMatchingEventHandler):
+        """Queues CSV files once they are complete (closed after writing, or renamed into place)."""
+        
+        def __init__(self, file_queue: "queue.Queue[Path]"):
+            super().__init__(patterns=["*.csv"], ignore_directories=True)
+            self.file_queue = file_queue
+        
+        def on_closed(self, event):
+            self.file_queue.put(Path(event.src_path))
+        
+        def on_moved(self, event):
+            self.file_queue.put(Path(event.dest_path))
+
+
 class FileWatcher:
     """
     Watches a directory for new CSV files and processes them.
@@ -71,6 +111,8 @@ class FileWatcher:
         self.processed_dir = self.data_dir / "processed"
         self.failed_dir = self.data_dir / "failed"
         self.poll_interval = poll_interval
+        # File sizes seen by the previous polling scan (see _settled_files)
+        self._last_sizes: dict[Path, int] = {}
         
         # Create directories
         self.watch_dir.mkdir(parents=True, exist_ok=True)
@@ -100,18 +142,50 @@ class FileWatcher:
         logger.info(f"  Poll interval: {self.poll_interval}s")
     
     def scan_for_files(self) -> list[Path]:
-        """Scan watch directory for CSV files."""
-        csv_files = list(self.watch_dir.glob("*.csv"))
-        # Also check subdirectories (one level deep)
-        csv_files.extend(self.watch_dir.glob("*/*.csv"))
+        """Scan watch directory for CSV files (hidden files and dirs are skipped)."""
+        # One scandir pass; entry types come from the directory listing, so
+        # there is no per-entry stat. Hidden entries (e.g. the scraper's
+        # .downloads temp dir) are skipped, as they are for inotify events.
+        csv_files = []
+        with os.scandir(self.watch_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    # Also check subdirectories (one level deep)
+                    with os.scandir(entry.path) as sub_entries:
+                        csv_files.extend(
+                            Path(sub.path) for sub in sub_entries
+                            if sub.name.endswith(".csv") and not sub.name.startswith(".")
+                            and sub.is_file()
+                        )
+                elif entry.name.endswith(".csv") and entry.is_file():
+                    csv_files.append(Path(entry.path))
         return sorted(csv_files)
     
-    def process_file(self, file_path: Path) -> bool:
+    def _watched_path(self, event_path: Path) -> Optional[Path]:
+        """
+        Map an absolute event path to the path scan_for_files() would return.
+        
+        Returns None for files the scan would not pick up (too deep, or inside
+        hidden files/dirs such as download temp dirs).
+        """
+        try:
+            parts = event_path.relative_to(self.watch_dir.resolve()).parts
+        except ValueError:
+            return None
+        if len(parts) > 2 or any(part.startswith(".") for part in parts):
+            return None
+        return self.watch_dir.joinpath(*parts)
+    
+    def process_file(self, file_path: Path, move: bool = True) -> bool:
         """
         Process a single CSV file.
         
         Args:
             file_path: Path to the CSV file
+            move: Move the file to processed_dir on success (callers batching
+                the database commit move it themselves once it is committed)
             
         Returns:
             True if processed successfully, False otherwise
@@ -133,7 +207,8 @@ class FileWatcher:
             logger.info(f"  Saved: {saved}, Skipped (duplicates): {skipped}")
             
             # Move to processed directory
-            self._move_to_processed(file_path)
+            if move:
+                self._move_to_processed(file_path)
             
             return True
             
@@ -146,6 +221,14 @@ class FileWatcher:
             self._move_to_failed(file_path, str(e))
             return False
     
+    @staticmethod
+    def _move(src: Path, dest: Path) -> None:
+        """Rename src to dest, copying only if they are on different filesystems."""
+        try:
+            os.replace(src, dest)
+        except OSError:
+            shutil.move(str(src), str(dest))
+    
     def _move_to_processed(self, file_path: Path) -> None:
         """Move a processed file to the processed directory."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -162,7 +245,7 @@ class FileWatcher:
         dest_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
         dest_path = dest_dir / dest_name
         
-        shutil.move(str(file_path), str(dest_path))
+        self._move(file_path, dest_path)
         logger.info(f"  Moved to: {dest_path}")
     
     def _move_to_failed(self, file_path: Path, error: str) -> None:
@@ -171,7 +254,7 @@ class FileWatcher:
         dest_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
         dest_path = self.failed_dir / dest_name
         
-        shutil.move(str(file_path), str(dest_path))
+        self._move(file_path, dest_path)
         
         # Write error log
         error_log = self.failed_dir / f"{file_path.stem}_{timestamp}.error"
@@ -179,34 +262,90 @@ class FileWatcher:
         
         logger.info(f"  Moved to failed: {dest_path}")
     
-    def run_once(self) -> int:
+    def _settled_files(self, files: list[Path]) -> list[Path]:
+        """
+        Keep only files whose size is unchanged since the previous scan.
+        
+        A polling scan can see a file while its producer is still writing it;
+        waiting one poll interval for the size to settle avoids parsing a
+        truncated file and moving it to failed_dir.
+        """
+        sizes = {}
+        for file_path in files:
+            try:
+                sizes[file_path] = file_path.stat().st_size
+            except FileNotFoundError:
+                continue
+        settled = [p for p, size in sizes.items() if self._last_sizes.get(p) == size]
+        self._last_sizes = {p: size for p, size in sizes.items() if p not in settled}
+        return settled
+    
+    def run_once(self, settle: bool = False) -> int:
         """
         Run a single scan and process cycle.
         
+        Args:
+            settle: Defer files that are new or still growing to the next
+                scan (for polling; one-off scans take everything they find)
+        
         Returns:
             Number of files processed
         """
         files = self.scan_for_files()
+        if settle:
+            files = self._settled_files(files)
         
         if not files:
             return 0
         
         logger.info(f"Found {len(files)} CSV file(s)")
         
-        processed = 0
-        for file_path in files:
-            if self.process_file(file_path):
-                processed += 1
+        return self._process_batch(files)
+    
+    def _process_batch(self, files: list[Path]) -> int:
+        """
+        Process files with one database commit for the whole batch.
+        
+        Files are only moved out of the watch dir once their rows are committed
+        (a failed commit leaves them in place to be retried, duplicates are
+        skipped then).
+        
+        Returns:
+            Number of files processed
+        """
+        processed_files = []
+        try:
+            with self.repo.batch():
+                for file_path in files:
+                    if self.process_file(file_path, move=False):
+                        processed_files.append(file_path)
+        except Exception as e:
+            # e.g. "database is locked" at commit: nothing was saved, so leave
+            # the files where they are for the next scan or event to retry
+            logger.error(f"  Database commit failed, will retry {len(processed_files)} file(s): {e}")
+            return 0
+        
+        for file_path in processed_files:
+            self._move_to_processed(file_path)
         
-        return processed
+        return len(processed_files)
     
-    def run(self) -> None:
-        """Run the watcher in continuous mode."""
-        logger.info("Starting file watcher (Ctrl+C to stop)")
+    def run(self, poll: bool = False) -> None:
+        """
+        Run the watcher in continuous mode.
+        
+        Args:
+            poll: Rescan every poll_interval seconds even if inotify is available
+        """
+        if not poll and WATCHDOG_AVAILABLE:
+            self._run_events()
+            return
+        
+        logger.info("Starting file watcher in polling mode (Ctrl+C to stop)")
         
         try:
             while True:
-                processed = self.run_once()
+                processed = self.run_once(settle=True)
                 
                 if processed > 0:
                     total = self.repo.count_transactions()
@@ -217,6 +356,59 @@ class FileWatcher:
         except KeyboardInterrupt:
             logger.info("Shutting down...")
             self.repo.close()
+    
+    def _run_events(self) -> None:
+        """Process files as inotify reports them, with a slow safety rescan when idle."""
+        file_queue: "queue.Queue[Path]" = queue.Queue()
+        observer = InotifyObserver()
+        observer.schedule(_CSVEventHandler(file_queue), str(self.watch_dir.resolve()), recursive=True)
+        observer.start()
+        logger.info("Starting file watcher in event mode (Ctrl+C to stop)")
+        
+        try:
+            # Pick up anything that arrived while the watcher was down
+            self.run_once()
+            
+            while True:
+                # Debounce: a drop of many files arrives as a burst of events;
+                # collect until the burst goes quiet (or the batch is full) and
+                # commit them together
+                try:
+                    event_paths = [file_queue.get(timeout=self.poll_interval)]
+                except queue.Empty:
+                    # Files moved in from outside the watch tree only produce a
+                    # "created" event (no close or move), so they are found here,
+                    # once their size is unchanged since the previous rescan
+                    if self.run_once(settle=True) > 0:
+                        total = self.repo.count_transactions()
+                        logger.info(f"Total transactions in database: {total}")
+                    continue
+                
+                while len(event_paths) < EVENT_BATCH_MAX:
+                    try:
+                        event_paths.append(file_queue.get(timeout=EVENT_DEBOUNCE_SECONDS))
+                    except queue.Empty:
+                        break
+                
+                # A file can be reported more than once; it is gone once processed
+                files = []
+                for event_path in dict.fromkeys(event_paths):
+                    file_path = self._watched_path(event_path)
+                    if file_path is not None and file_path.exists():
+                        files.append(file_path)
+                if not files:
+                    continue
+                
+                if self._process_batch(files) > 0:
+                    total = self.repo.count_transactions()
+                    logger.info(f"Total transactions in database: {total}")
+                
+        except KeyboardInterrupt:
+            logger.info("Shutting down...")
+        finally:
+            observer.stop()
+            observer.join()
+            self.repo.close()
 
 
 def parse_args():
@@ -244,7 +436,14 @@ def parse_args():
         "--poll-interval", "-i",
         type=int,
         default=int(os.environ.get("POLL_INTERVAL", "30")),
-        help="Seconds between folder scans (default: 30 or $POLL_INTERVAL)"
+        help="Seconds between folder scans in polling mode (default: 30 or $POLL_INTERVAL)"
+    )
+    
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        default=os.environ.get("WATCH_POLL", "false").lower() == "true",
+        help="Poll the folder instead of using inotify events (default: false or $WATCH_POLL)"
     )
     
     parser.add_argument(
@@ -282,7 +481,7 @@ def main():
         watcher.repo.close()
         return 0
     else:
-        watcher.run()
+        watcher.run(poll=args.poll)
         return 0
 
 
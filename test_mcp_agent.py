@@ -10,41 +10,68 @@ Run with:
 """
 
 import asyncio
+from contextlib import AsyncExitStack
 from mcp_agent.app import MCPApp
 from mcp_agent.agents.agent import Agent
 from mcp_agent.workflows.llm.augmented_llm_anthropic import AnthropicAugmentedLLM
 
 app = MCPApp(name="finance_report")
 
-async def test():
-    async with app.run() as running_app:
-        logger = running_app.logger
-        
-        # Create agent with our family-finance MCP server
-        agent = Agent(
-            name="finance_analyst",
-            instruction="""You are a financial analyst. Use the available tools to query 
-            transaction data and provide insights. Always format your responses in markdown.""",
-            server_names=["family-finance"],
-        )
-        
-        async with agent:
-            # List available tools (returns list of tuples or Tool objects)
-            tools = await agent.list_tools()
-            tool_names = [t[0] if isinstance(t, tuple) else t.name for t in tools]
-            logger.info(f"Available tools: {tool_names}")
-            
-            # Attach Anthropic LLM (uses claude-sonnet-4-5-20250514 from config)
-            llm = await agent.attach_llm(AnthropicAugmentedLLM)
+
+class FinanceAgent:
+    """
+    Agent + Anthropic LLM connected to the family-finance MCP server.
+    
+    The app, the MCP server connection and the LLM are set up once on enter,
+    so several queries share one handshake:
+    
+        async with FinanceAgent() as fa:
+            for q in queries:
+                print(await fa.ask(q))
+    """
+    
+    async def __aenter__(self):
+        self._stack = AsyncExitStack()
+        try:
+            running_app = await self._stack.enter_async_context(app.run())
+            self.logger = running_app.logger
             
-            # Generate a simple report
-            result = await llm.generate_str(
-                message="What months have transaction data? Just list them briefly."
+            # Create agent with our family-finance MCP server
+            self.agent = Agent(
+                name="finance_analyst",
+                instruction="""You are a financial analyst. Use the available tools to query 
+                transaction data and provide insights. Always format your responses in markdown.""",
+                server_names=["family-finance"],
             )
-            print("\n" + "="*50)
-            print("RESULT:")
-            print("="*50)
-            print(result)
+            await self._stack.enter_async_context(self.agent)
+            
+            # List available tools once (returns list of tuples or Tool objects)
+            tools = await self.agent.list_tools()
+            self.tool_names = [t[0] if isinstance(t, tuple) else t.name for t in tools]
+            self.logger.info(f"Available tools: {self.tool_names}")
+            
+            # Attach Anthropic LLM (uses claude-sonnet-4-5-20250514 from config)
+            self.llm = await self.agent.attach_llm(AnthropicAugmentedLLM)
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self._stack.aclose()
+    
+    async def ask(self, message: str) -> str:
+        return await self.llm.generate_str(message=message)
+
+
+async def test():
+    async with FinanceAgent() as fa:
+        # Generate a simple report
+        result = await fa.ask("What months have transaction data? Just list them briefly.")
+        print("\n" + "="*50)
+        print("RESULT:")
+        print("="*50)
+        print(result)
 
 if __name__ == "__main__":
     asyncio.run(test())